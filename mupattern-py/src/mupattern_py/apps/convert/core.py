@@ -3,35 +3,60 @@
 from __future__ import annotations
 
 import csv
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from pathlib import Path
 
+import numpy as np
 import tifffile
 
-from ...common.nd2_utils import read_frame_2d
-from ...common.slices import parse_slice_string
+from ...common.nd2_utils import read_position_block
+from ...common.parallel import default_workers
+from ...common.slices import SliceSpec, resolve_slice
 from ...common.progress import ProgressCallback
 
+# 256x256 tiles + fast deflate: tiles let readers decode sub-rectangles; deflate (not zstd)
+# because the Rust `tiff` crate and UTIF in the desktop/web viewers cannot decode zstd.
+_TIFF_OPTIONS = {"tile": (256, 256), "compression": "zlib", "compressionargs": {"level": 1}}
+
+# Upper bound on decoded frames held in memory: two (T, C, Z, Y, X) blocks, one being encoded while the next is read.
+_MEM_BUDGET_BYTES = 512 * 1024 * 1024
+
 
 def run_convert(
     input_nd2: Path,
-    pos_slice: str,
-    time_slice: str,
+    pos_slice: str | SliceSpec,
+    time_slice: str | SliceSpec,
     output: Path,
     *,
+    nd2_file=None,
+    mem_budget_bytes: int = _MEM_BUDGET_BYTES,
     on_progress: ProgressCallback | None = None,
 ) -> None:
     """Convert an ND2 file into per-position TIFF folders."""
-    import nd2
-
-    f = nd2.ND2File(str(input_nd2))
+    if nd2_file is None:
+        import nd2
+
+        with nd2.ND2File(str(input_nd2)) as f:
+            return run_convert(
+                input_nd2,
+                pos_slice,
+                time_slice,
+                output,
+                nd2_file=f,
+                mem_budget_bytes=mem_budget_bytes,
+                on_progress=on_progress,
+            )
+
+    f = nd2_file
     sizes = f.sizes
     n_pos = sizes.get("P", 1)
     n_time = sizes.get("T", 1)
     n_chan = sizes.get("C", 1)
     n_z = sizes.get("Z", 1)
 
-    pos_indices = parse_slice_string(pos_slice, n_pos)
-    time_indices = parse_slice_string(time_slice, n_time)
+    pos_indices = resolve_slice(pos_slice, n_pos)
+    time_indices = resolve_slice(time_slice, n_time)
 
     total = len(pos_indices) * len(time_indices) * n_chan * n_z
     if on_progress:
@@ -43,34 +68,64 @@ def run_convert(
 
     output.mkdir(parents=True, exist_ok=True)
 
+    # Timepoints are read a block at a time per position; each frame of the block is then encoded
+    # to TIFF on a worker thread while the next block is read.
+    frame_bytes = sizes.get("Y", 1) * sizes.get("X", 1) * np.dtype(f.dtype).itemsize
+    block_t = max(1, mem_budget_bytes // 2 // (n_chan * n_z * frame_bytes))
+    workers = default_workers()
+    lock = threading.Lock()
     done = 0
-    for p_idx in pos_indices:
-        pos_dir = output / f"Pos{p_idx}"
-        pos_dir.mkdir(exist_ok=True)
-
-        with open(pos_dir / "time_map.csv", "w", newline="") as fh:
-            writer = csv.writer(fh)
-            writer.writerow(["t", "t_real"])
-            for t_new, t_orig in enumerate(time_indices):
-                writer.writerow([t_new, t_orig])
-
-        for t_new, t_orig in enumerate(time_indices):
-            for c in range(n_chan):
-                for z in range(n_z):
-                    frame = read_frame_2d(f, p_idx, t_orig, c, z)
-
-                    fname = (
-                        f"img_channel{c:03d}"
-                        f"_position{p_idx:03d}"
-                        f"_time{t_new:09d}"
-                        f"_z{z:03d}.tif"
-                    )
-                    tifffile.imwrite(str(pos_dir / fname), frame)
-                    done += 1
-
-                    if on_progress and total > 0:
-                        on_progress(done / total, f"Writing TIFFs {done}/{total}")
-
-    f.close()
+    errors: list[BaseException] = []
+
+    def _written(fut: Future) -> None:
+        nonlocal done
+        exc = fut.exception()
+        with lock:
+            if exc is not None:
+                errors.append(exc)
+                return
+            done += 1
+            if on_progress and total > 0:
+                on_progress(done / total, f"Writing TIFFs {done}/{total}")
+
+    def _write_frame(path: Path, frame: np.ndarray) -> None:
+        tifffile.imwrite(str(path), frame, **_TIFF_OPTIONS)
+
+    in_flight: list[Future] = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for p_idx in pos_indices:
+            pos_dir = output / f"Pos{p_idx}"
+            pos_dir.mkdir(exist_ok=True)
+
+            with open(pos_dir / "time_map.csv", "w", newline="") as fh:
+                writer = csv.writer(fh)
+                writer.writerow(["t", "t_real"])
+                for t_new, t_orig in enumerate(time_indices):
+                    writer.writerow([t_new, t_orig])
+
+            for start in range(0, len(time_indices), block_t):
+                block = read_position_block(f, p_idx, time_indices[start : start + block_t])
+                wait(in_flight)  # previous block fully encoded; at most two blocks are alive
+                if errors:
+                    break
+                in_flight = []
+                for i in range(len(block)):
+                    t_new = start + i
+                    for c in range(n_chan):
+                        for z in range(n_z):
+                            fname = (
+                                f"img_channel{c:03d}"
+                                f"_position{p_idx:03d}"
+                                f"_time{t_new:09d}"
+                                f"_z{z:03d}.tif"
+                            )
+                            fut = pool.submit(_write_frame, pos_dir / fname, block[i, c, z])
+                            fut.add_done_callback(_written)
+                            in_flight.append(fut)
+            if errors:
+                break
+
+    if errors:
+        raise errors[0]
     if on_progress:
         on_progress(1.0, f"Wrote {output}")
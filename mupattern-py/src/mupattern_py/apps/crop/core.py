@@ -2,14 +2,20 @@
 
 from __future__ import annotations
 
-import csv
+import itertools
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
 import numpy as np
 import tifffile
 import zarr
 
+from ...common.fs import list_pos_dirs
+from ...common.io_zarr import open_zarr_group
+from ...common.parallel import prefetch_map, resolve_jobs
 from ...common.slices import parse_slice_string
 from ...common.progress import ProgressCallback
 
@@ -19,10 +25,11 @@ def _draw_marker(
 ) -> None:
     """Draw a white diagonal cross (X) at (y, x), overwriting pixels."""
     white = 255 if len(frame.shape) == 2 else np.array([255, 255, 255], dtype=np.uint8)
-    for d in range(-size, size + 1):
-        for yy, xx in [(y + d, x + d), (y + d, x - d)]:
-            if 0 <= yy < h and 0 <= xx < w:
-                frame[yy, xx] = white
+    d = np.arange(-size, size + 1)
+    ys = np.concatenate([y + d, y + d])
+    xs = np.concatenate([x + d, x - d])
+    valid = (0 <= ys) & (ys < h) & (0 <= xs) & (xs < w)
+    frame[ys[valid], xs[valid]] = white
 
 
 _TIFF_RE = re.compile(r"img_channel(\d+)_position(\d+)_time(\d+)_z(\d+)\.tif")
@@ -34,26 +41,20 @@ def _shard_shape(shape: tuple[int, ...]) -> tuple[int, ...]:
 
 def _discover_tiffs(pos_dir: Path) -> dict[tuple[int, int, int], Path]:
     """Return {(channel, time, z): path} for every TIFF in *pos_dir*."""
-    index: dict[tuple[int, int, int], Path] = {}
-    for p in sorted(pos_dir.iterdir()):
-        m = _TIFF_RE.match(p.name)
-        if m is None:
-            continue
-        c, _pos, t, z = (int(g) for g in m.groups())
-        index[(c, t, z)] = p
-    return index
-
-
-def _median_outside_mask(frame: np.ndarray, mask: np.ndarray) -> np.uint16:
-    """Median of frame pixels outside mask. O(n) via partition. Integer space, returns uint16."""
-    values = np.asarray(frame[~mask].flatten(), dtype=np.uint32)
+    with os.scandir(pos_dir) as it:
+        matches = [(m, e.path) for e in it if (m := _TIFF_RE.match(e.name))]
+    return {(int(m[1]), int(m[3]), int(m[4])): Path(p) for m, p in matches}
+
+
+def _median_outside_mask(frame: np.ndarray, bg_idx: np.ndarray) -> np.uint16:
+    """Median of the frame pixels at flat indices *bg_idx* (outside all crops), as uint16."""
+    values = frame.ravel()[bg_idx]
     if values.size == 0:
         return np.uint16(0)
     mid = values.size // 2
+    values.partition(mid)
     if values.size % 2 == 1:
-        np.partition(values, mid)
         return np.uint16(values[mid])
-    np.partition(values, mid)
     left_max = int(np.max(values[:mid]))
     return np.uint16((left_max + int(values[mid])) // 2)
 
@@ -66,13 +67,35 @@ def _axis_range(index: dict[tuple[int, int, int], Path]) -> tuple[int, int, int]
     return len(cs), len(ts), len(zs)
 
 
+@lru_cache(maxsize=8)
+def _load_bbox_table(csv_path: str, mtime_ns: int, size: int) -> tuple[tuple[str, ...], np.ndarray]:
+    """Parse a bbox CSV with pyarrow from a memory map; cached per (path, mtime, size)."""
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+
+    with pa.memory_map(csv_path) as source:
+        table = pacsv.read_csv(source)
+    values = np.empty((table.num_rows, table.num_columns), dtype=np.int64)
+    for j, column in enumerate(table.columns):
+        values[:, j] = column.to_numpy(zero_copy_only=False)
+    return tuple(table.column_names), values
+
+
+def _bbox_table(csv_path: Path) -> tuple[tuple[str, ...], np.ndarray]:
+    st = os.stat(csv_path)
+    return _load_bbox_table(str(csv_path), st.st_mtime_ns, st.st_size)
+
+
 def _read_bbox_csv(csv_path: Path) -> list[dict[str, int]]:
     """Parse the mupattern bbox CSV -> list of {crop, x, y, w, h}."""
-    rows: list[dict[str, int]] = []
-    with open(csv_path, newline="") as fh:
-        for row in csv.DictReader(fh):
-            rows.append({k: int(v) for k, v in row.items()})
-    return rows
+    names, values = _bbox_table(csv_path)
+    return [dict(zip(names, row)) for row in values.tolist()]
+
+
+def bbox_array(csv_path: Path) -> np.ndarray:
+    """Bounding boxes from the bbox CSV as an (N, 4) int32 array of x, y, w, h."""
+    names, values = _bbox_table(csv_path)
+    return values[:, [names.index(k) for k in ("x", "y", "w", "h")]].astype(np.int32)
 
 
 def run_crop(
@@ -82,14 +105,16 @@ def run_crop(
     output: Path,
     background: bool = False,
     *,
+    jobs: int = 0,
     on_progress: ProgressCallback | None = None,
 ) -> None:
     """Crop pattern positions from microscopy TIFFs into a zarr store."""
-    pos_dir = input_dir / f"Pos{pos}"
-    if not pos_dir.is_dir():
-        raise FileNotFoundError(f"Position directory not found: {pos_dir}")
+    pos_dir = list_pos_dirs(input_dir).get(pos)
+    if pos_dir is None:
+        raise FileNotFoundError(f"Position directory not found: {input_dir / f'Pos{pos}'}")
 
     bboxes = _read_bbox_csv(bbox)
+    boxes = bbox_array(bbox).tolist()
 
     index = _discover_tiffs(pos_dir)
     if not index:
@@ -102,16 +127,19 @@ def run_crop(
     sample = tifffile.imread(next(iter(index.values())))
     dtype = sample.dtype
 
-    root = zarr.open_group(str(output), mode="a", zarr_format=3)
+    root = open_zarr_group(output, mode="a")
     crop_grp = root.require_group(f"pos/{pos:03d}/crop")
 
+    # One chunk holds a stripe of timepoints for one (c, z), matching the write pattern below
+    t_chunk = min(64, n_times)
+
     arrays: list[zarr.Array] = []
-    for i, bb in enumerate(bboxes):
-        shape = (n_times, n_channels, n_z, bb["h"], bb["w"])
+    for i, (bb, (_x, _y, w, h)) in enumerate(zip(bboxes, boxes)):
+        shape = (n_times, n_channels, n_z, h, w)
         arr = crop_grp.create_array(
             f"{i:03d}",
-            shape=(n_times, n_channels, n_z, bb["h"], bb["w"]),
-            chunks=(1, 1, 1, bb["h"], bb["w"]),
+            shape=shape,
+            chunks=(t_chunk, 1, 1, h, w),
             shards=_shard_shape(shape),
             dtype=dtype,
             overwrite=True,
@@ -124,15 +152,15 @@ def run_crop(
     bg_arr = None
     if background:
         mask = np.zeros(sample.shape, dtype=bool)
-        for bb in bboxes:
-            x, y, w, h = bb["x"], bb["y"], bb["w"], bb["h"]
+        for x, y, w, h in boxes:
             mask[y : y + h, x : x + w] = True
+        bg_idx = np.flatnonzero(~mask.ravel())
 
         bg_shape = (n_times, n_channels, n_z)
         bg_arr = root.create_array(
             f"pos/{pos:03d}/background",
             shape=(n_times, n_channels, n_z),
-            chunks=(1, 1, 1),
+            chunks=(t_chunk, 1, 1),
             shards=_shard_shape(bg_shape),
             dtype=np.uint16,
             overwrite=True,
@@ -141,18 +169,48 @@ def run_crop(
         bg_arr.attrs["axis_names"] = ["t", "c", "z"]
         bg_arr.attrs["description"] = "Median of pixels outside all crop bounding boxes"
 
-    sorted_keys = sorted(index.keys())
-    total = len(sorted_keys)
-    for i, (c, t, z) in enumerate(sorted_keys):
-        frame = tifffile.imread(index[(c, t, z)])
-        for crop_idx, bb in enumerate(bboxes):
-            x, y, w, h = bb["x"], bb["y"], bb["w"], bb["h"]
-            arrays[crop_idx][t, c, z] = frame[y : y + h, x : x + w]
-        if bg_arr is not None:
-            bg_arr[t, c, z] = _median_outside_mask(frame, mask)
-
-        if on_progress and total > 0:
-            on_progress((i + 1) / total, f"Reading frames {i + 1}/{total}")
+    # Decode TIFFs in worker processes, in the same (c, z, t) order the loop below consumes them
+    paths = [
+        index[(c, t, z)]
+        for c in range(n_channels)
+        for z in range(n_z)
+        for t in range(n_times)
+        if (c, t, z) in index
+    ]
+    total = len(paths)
+    done = 0
+    # Stripe buffers are allocated once and refilled for every (c, z, t0) block
+    stripes = [np.empty((t_chunk, h, w), dtype=dtype) for _x, _y, w, h in boxes]
+    bg_stripe = np.empty(t_chunk, dtype=np.uint16)
+    # The read-ahead depth is sized for the pool's workers, not the default prefetch worker count
+    n_workers = resolve_jobs(jobs)
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        frames = prefetch_map(tifffile.imread, paths, max_workers=n_workers, executor=pool)
+        for c in range(n_channels):
+            for z in range(n_z):
+                for t0 in range(0, n_times, t_chunk):
+                    t1 = min(t0 + t_chunk, n_times)
+                    for t in range(t0, t1):
+                        if (c, t, z) not in index:
+                            for stripe in stripes:
+                                stripe[t - t0] = 0
+                            bg_stripe[t - t0] = 0
+                            continue
+                        frame = next(frames)
+                        for stripe, (x, y, w, h) in zip(stripes, boxes):
+                            stripe[t - t0] = frame[y : y + h, x : x + w]
+                        if bg_arr is not None:
+                            bg_stripe[t - t0] = _median_outside_mask(frame, bg_idx)
+
+                        done += 1
+                        if on_progress and total > 0:
+                            on_progress(done / total, f"Reading frames {done}/{total}")
+
+                    n = t1 - t0
+                    for arr, stripe in zip(arrays, stripes):
+                        arr[t0:t1, c, z] = stripe[:n]
+                    if bg_arr is not None:
+                        bg_arr[t0:t1, c, z] = bg_stripe[:n]
 
     if on_progress:
         on_progress(1.0, f"Wrote {output}")
@@ -169,15 +227,16 @@ def run_movie(
     colormap: str,
     spots_path: Path | None = None,
     *,
+    jobs: int = 0,
     on_progress: ProgressCallback | None = None,
 ) -> None:
     """Create a movie from a zarr crop."""
     import csv
 
     import imageio
-    import matplotlib.cm as cm
+    import matplotlib
 
-    root = zarr.open_group(str(input_zarr), mode="r", zarr_format=3)
+    root = open_zarr_group(input_zarr, mode="r")
     crop_grp = root[f"pos/{pos:03d}/crop"]
     crop_id = f"{crop_idx:03d}"
 
@@ -206,39 +265,50 @@ def run_movie(
                 key = (t_val, c)
                 spots_by_t_crop.setdefault(key, []).append((y_val, x_val))
 
-    frames_raw = []
-    for i, t in enumerate(time_indices):
-        frame = np.array(arr[t, channel, 0])
-        frames_raw.append(frame)
+    # One read per zarr chunk along t (time_indices is sorted), so each chunk is decoded once
+    # rather than once per selected frame it holds
+    t_chunk = arr.chunks[0]
+    slabs = [list(ts) for _, ts in itertools.groupby(time_indices, key=lambda t: t // t_chunk)]
+    slabs_raw = []
+    n_read = 0
+    reads = prefetch_map(
+        lambda ts: np.asarray(arr.get_orthogonal_selection((ts, channel, 0))),
+        slabs,
+        max_workers=resolve_jobs(jobs),
+    )
+    for slab in reads:
+        slabs_raw.append(slab)
+        n_read += len(slab)
         if on_progress:
             n = len(time_indices)
-            on_progress((i + 1) / n * 0.4, f"Reading frames {i + 1}/{n}")
+            on_progress(n_read / n * 0.4, f"Reading frames {n_read}/{n}")
 
-    if not frames_raw:
+    if not slabs_raw:
         raise ValueError("No frames to write")
 
-    global_min = float(min(f.min() for f in frames_raw))
-    global_max = float(max(f.max() for f in frames_raw))
-
-    if colormap == "grayscale":
-        cmap = None
+    cube = np.concatenate(slabs_raw)
+    global_min = float(cube.min())
+    global_max = float(cube.max())
+    if global_max > global_min:
+        normalized = (cube - global_min) / (global_max - global_min)
     else:
-        cmap = cm.get_cmap(colormap)
-
-    frames = []
-    for frame in frames_raw:
-        if global_max > global_min:
-            normalized = (frame - global_min) / (global_max - global_min)
-        else:
-            normalized = np.zeros_like(frame, dtype=np.float64)
+        normalized = np.zeros(cube.shape, dtype=np.float64)
 
-        if cmap is None:
-            frame_uint8 = (normalized * 255).astype(np.uint8)
-        else:
-            colored = cmap(normalized)
-            frame_uint8 = (colored[:, :, :3] * 255).astype(np.uint8)
+    # libx264 wants dimensions divisible by 16: write straight into a zero-padded buffer
+    n_frames, h, w = cube.shape
+    pad_h = (16 - (h % 16)) % 16
+    pad_w = (16 - (w % 16)) % 16
+    channels = () if colormap == "grayscale" else (3,)
+    out = np.zeros((n_frames, h + pad_h, w + pad_w, *channels), dtype=np.uint8)
 
-        frames.append(frame_uint8)
+    if colormap == "grayscale":
+        out[:, :h, :w] = normalized * 255
+    else:
+        cmap = matplotlib.colormaps[colormap]
+        # Same binning as cmap(normalized), but one table lookup for the whole cube
+        lut = (cmap(np.arange(cmap.N))[:, :3] * 255).astype(np.uint8)
+        lut_idx = np.minimum(normalized * cmap.N, cmap.N - 1).astype(np.intp)
+        out[:, :h, :w] = lut[lut_idx]
 
     if spots_path is not None and spots_by_t_crop:
         for i, t_val in enumerate(time_indices):
@@ -246,30 +316,12 @@ def run_movie(
             spot_list = spots_by_t_crop.get(key)
             if spot_list is None:
                 continue
-            frame = frames[i]
-            h, w = frame.shape[0], frame.shape[1]
+            frame = out[i]
             for y_f, x_f in spot_list:
                 y_p, x_p = int(round(y_f)), int(round(x_f))
                 _draw_marker(frame, y_p, x_p, h, w)
 
-    if frames:
-        if len(frames[0].shape) == 2:
-            h, w = frames[0].shape
-            pad_h = (16 - (h % 16)) % 16
-            pad_w = (16 - (w % 16)) % 16
-        else:
-            h, w, _ = frames[0].shape
-            pad_h = (16 - (h % 16)) % 16
-            pad_w = (16 - (w % 16)) % 16
-        if pad_h > 0 or pad_w > 0:
-            pads = (
-                ((0, pad_h), (0, pad_w))
-                if len(frames[0].shape) == 2
-                else ((0, pad_h), (0, pad_w), (0, 0))
-            )
-            frames = [
-                np.pad(f, pads, mode="constant", constant_values=0) for f in frames
-            ]
+    frames = list(out)
 
     output.parent.mkdir(parents=True, exist_ok=True)
 
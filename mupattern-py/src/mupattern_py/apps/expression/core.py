@@ -7,7 +7,9 @@ from pathlib import Path
 import numpy as np
 import pandas as pd
 
+from ...common.io_csv import write_csv_columns
 from ...common.io_zarr import open_zarr_group
+from ...common.parallel import prefetch_map
 from ...common.progress import ProgressCallback
 
 
@@ -25,30 +27,46 @@ def run_analyze(
     crop_ids = sorted(crop_grp.keys())
 
     bg_arr = root[f"pos/{pos:03d}/background"]
-
-    rows: list[tuple[int, str, int, int, int]] = []
+    # per-pixel background per t (crops.zarr background is uint16), shared by all crops
+    bg_all = np.asarray(bg_arr[:, channel, 0]).astype(np.int64)
+
+    t_cols: list[np.ndarray] = []
+    crop_cols: list[np.ndarray] = []
+    sum_cols: list[np.ndarray] = []
+    area_cols: list[np.ndarray] = []
+    bg_cols: list[np.ndarray] = []
     total = len(crop_ids)
-    for i, crop_id in enumerate(crop_ids):
-        arr = crop_grp[crop_id]
-        n_times = arr.shape[0]
-        area = arr.shape[3] * arr.shape[4]  # h * w
+    blocks = prefetch_map(lambda cid: np.asarray(crop_grp[cid][:, channel, 0]), crop_ids)
+    for i, (crop_id, block) in enumerate(zip(crop_ids, blocks)):
+        n_times = block.shape[0]
+        area = block.shape[1] * block.shape[2]  # h * w
 
-        for t in range(n_times):
-            intensity = int(np.array(arr[t, channel, 0]).sum())
-            background = int(bg_arr[t, channel, 0])  # per-pixel (crops.zarr background is uint16)
-            rows.append((t, crop_id, intensity, area, background))
+        t_cols.append(np.arange(n_times, dtype=np.int64))
+        crop_cols.append(np.full(n_times, crop_id, dtype=object))
+        sum_cols.append(block.reshape(n_times, -1).sum(axis=1, dtype=np.int64))
+        area_cols.append(np.full(n_times, area, dtype=np.int64))
+        bg_cols.append(bg_all[:n_times])
 
         if on_progress and total > 0:
             on_progress((i + 1) / total, f"Processing crop {i + 1}/{total}")
 
-    output.parent.mkdir(parents=True, exist_ok=True)
-    with open(output, "w", newline="") as fh:
-        fh.write("t,crop,intensity,area,background\n")
-        for t, crop, intensity, area, background in rows:
-            fh.write(f"{t},{crop},{intensity},{area},{background}\n")
+    def _cat(cols: list[np.ndarray], dtype) -> np.ndarray:
+        return np.concatenate(cols) if cols else np.empty(0, dtype=dtype)
+
+    n_rows = sum(len(c) for c in t_cols)
+    write_csv_columns(
+        output,
+        {
+            "t": _cat(t_cols, np.int64),
+            "crop": _cat(crop_cols, object),
+            "intensity": _cat(sum_cols, np.int64),
+            "area": _cat(area_cols, np.int64),
+            "background": _cat(bg_cols, np.int64),
+        },
+    )
 
     if on_progress:
-        on_progress(1.0, f"Wrote {len(rows)} rows to {output}")
+        on_progress(1.0, f"Wrote {n_rows} rows to {output}")
 
 
 def run_plot(input_csv: Path, output: Path) -> None:
@@ -84,23 +102,8 @@ def run_plot(input_csv: Path, output: Path) -> None:
         ax.plot(group["t"], group["intensity_above_bg"], color=bulk_color, linestyle="-", linewidth=1)
 
     # Median per t (like ExpressionTab dataWithMedian)
-    by_t: dict[int, list[float]] = {}
-    for _, row in df.iterrows():
-        v = row["intensity_above_bg"]
-        if isinstance(v, (int, float)) and not (isinstance(v, float) and v != v):
-            by_t.setdefault(int(row["t"]), []).append(float(v))
-    t_sorted = sorted(by_t.keys())
-    median_vals = []
-    for t in t_sorted:
-        vals = by_t[t]
-        if vals:
-            sorted_v = sorted(vals)
-            m = len(sorted_v) // 2
-            med = sorted_v[m] if len(sorted_v) % 2 else (sorted_v[m - 1] + sorted_v[m]) / 2
-            median_vals.append(med)
-        else:
-            median_vals.append(float("nan"))
-    ax.plot(t_sorted, median_vals, color="red", linestyle="-", linewidth=2, label="median")
+    median = df.groupby("t")["intensity_above_bg"].median().sort_index()
+    ax.plot(median.index, median.values, color="red", linestyle="-", linewidth=2, label="median")
 
     ax.set_ylabel("fluorescence")
     ax.set_title("Background-corrected total fluorescence")
@@ -2,80 +2,91 @@
 
 from __future__ import annotations
 
-import csv
+import logging
+import os
+import tempfile
 from pathlib import Path
 
 import numpy as np
 import pandas as pd
-import zarr
 from PIL import Image as PILImage
 
+from ...common.io_csv import csv_column_writer
 from ...common.io_zarr import open_zarr_group
+from ...common.parallel import prefetch_iter, prefetch_map
 from ...common.progress import ProgressCallback
 
+logger = logging.getLogger(__name__)
+
 
 def _load_csv(csv_path: Path) -> pd.DataFrame:
-    """Load a predictions/annotations CSV (t,crop,label) into a DataFrame."""
-    df = pd.read_csv(csv_path, dtype={"crop": str})
-    if df["label"].dtype == object:
-        df["label"] = df["label"].map({"true": True, "false": False})
-    else:
-        df["label"] = df["label"].astype(bool)
-    return df
+    """Load a t,crop,label CSV into a DataFrame."""
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+
+    # crop stays a string (zero-padded ids); label accepts true/false as well as 1/0
+    column_types = {"t": pa.int64(), "crop": pa.string(), "label": pa.bool_()}
+    with pa.memory_map(str(csv_path)) as source:
+        table = pacsv.read_csv(source, convert_options=pacsv.ConvertOptions(column_types=column_types))
+    return table.to_pandas()
 
 
 def _load_annotations(csv_path: Path) -> dict[str, bool]:
     """Load annotations CSV → {"t:cropId": bool}."""
-    annotations: dict[str, bool] = {}
-    with open(csv_path, newline="") as fh:
-        for row in csv.DictReader(fh):
-            key = f"{row['t']}:{row['crop']}"
-            annotations[key] = row["label"] == "true"
-    return annotations
+    df = _load_csv(csv_path)
+    keys = (df["t"].astype(str) + ":" + df["crop"]).tolist()
+    return dict(zip(keys, df["label"].tolist()))
+
+
+def _violation_mask(df: pd.DataFrame) -> np.ndarray:
+    """True where a crop reappears after an absent frame; *df* sorted by (crop, t)."""
+    # A missing label counts as present, as in the original row loop (NaN is truthy)
+    label = df["label"].to_numpy(dtype=bool, na_value=True)
+    crop, _ = pd.factorize(df["crop"])
+    n = len(label)
+    if n == 0:
+        return label
+    # One pass: running count of absent frames, rebased at the first row of each crop
+    absent = np.cumsum(~label, dtype=np.int64)
+    starts = np.flatnonzero(np.concatenate(([True], crop[1:] != crop[:-1])))
+    before_crop = absent[starts] - ~label[starts]
+    return label & (absent > np.repeat(before_crop, np.diff(np.append(starts, n))))
 
 
 def _find_violations(df: pd.DataFrame) -> pd.DataFrame:
     """Find crops that violate monotonicity."""
-    violations = []
-    for crop_id, group in df.groupby("crop"):
-        group = group.sort_values("t")
-        seen_false = False
-        for _, row in group.iterrows():
-            if not row["label"]:
-                seen_false = True
-            elif seen_false:
-                violations.append(row)
-    if violations:
-        return pd.DataFrame(violations)
-    return pd.DataFrame(columns=df.columns)
+    df = df.sort_values(["crop", "t"])
+    return df.loc[_violation_mask(df)]
 
 
 def _clean_df(df: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
     """Enforce monotonicity: once a crop goes false, force all later frames false."""
-    corrected = []
-    rows = []
-
-    for crop_id, group in df.groupby("crop"):
-        group = group.sort_values("t").copy()
-        seen_false = False
-
-        for idx, row in group.iterrows():
-            if not row["label"]:
-                seen_false = True
-                rows.append(row)
-            elif seen_false:
-                corrected.append(row.to_dict())
-                new_row = row.copy()
-                new_row["label"] = False
-                rows.append(new_row)
-            else:
-                rows.append(row)
-
-    cleaned = pd.DataFrame(rows)
-    report = pd.DataFrame(corrected) if corrected else pd.DataFrame(columns=df.columns)
+    df = df.sort_values(["crop", "t"]).reset_index(drop=True)
+    corrected = _violation_mask(df)
+    report = df.loc[corrected]
+    cleaned = df.copy()
+    cleaned.loc[corrected, "label"] = False
     return cleaned, report
 
 
+def _normalize_frames(block: np.ndarray) -> np.ndarray:
+    """Per-frame min/max normalize a (T, H, W) block to uint8. Flat frames become zeros."""
+    flat = block.reshape(block.shape[0], -1)
+    lo = flat.min(axis=1).astype(np.float64)[:, None, None]
+    hi = flat.max(axis=1).astype(np.float64)[:, None, None]
+    rng = np.where(hi > lo, hi - lo, 1.0)
+    return ((block - lo) / rng * 255).astype(np.uint8)
+
+
+def _processor_target_size(processor) -> tuple[int, int]:
+    """(height, width) the image processor resizes to."""
+    size = processor.size
+    if "height" in size and "width" in size:
+        return int(size["height"]), int(size["width"])
+    edge = int(size["shortest_edge"])
+    return edge, edge
+
+
 def run_dataset(
     zarr_path: Path,
     pos: int,
@@ -93,40 +104,34 @@ def run_dataset(
     crop_grp = root[f"pos/{pos:03d}/crop"]
     crop_ids = sorted(crop_grp.keys())
 
-    examples = []
+    kept_by_crop = {
+        crop_id: [t for t in range(crop_grp[crop_id].shape[0]) if f"{t}:{crop_id}" in ann_dict]
+        for crop_id in crop_ids
+    }
+    if not any(kept_by_crop.values()):
+        raise ValueError("No labeled samples found")
+
     total = len(crop_ids)
-    for i, crop_id in enumerate(crop_ids):
-        arr = crop_grp[crop_id]
-        n_times = arr.shape[0]
-
-        for t in range(n_times):
-            key = f"{t}:{crop_id}"
-            if key not in ann_dict:
-                continue
-
-            frame = np.array(arr[t, 0, 0])
-            lo, hi = float(frame.min()), float(frame.max())
-            if hi > lo:
-                normalized = ((frame - lo) / (hi - lo) * 255).astype(np.uint8)
-            else:
-                normalized = np.zeros_like(frame, dtype=np.uint8)
-
-            img = PILImage.fromarray(normalized, mode="L")
-            examples.append(
-                {
-                    "image": img,
-                    "label": int(ann_dict[key]),
+
+    def _read(crop_id: str) -> np.ndarray | None:
+        if not kept_by_crop[crop_id]:
+            return None
+        return _normalize_frames(np.asarray(crop_grp[crop_id][:, 0, 0]))
+
+    def _examples():
+        blocks = prefetch_map(_read, crop_ids)
+        for i, (crop_id, normalized) in enumerate(zip(crop_ids, blocks)):
+            for t in kept_by_crop[crop_id]:
+                yield {
+                    "image": PILImage.fromarray(normalized[t], mode="L"),
+                    "label": int(ann_dict[f"{t}:{crop_id}"]),
                     "pos": str(pos),
                     "crop": crop_id,
                     "t": t,
                 }
-            )
-
-        if on_progress and total > 0:
-            on_progress((i + 1) / total, f"Processing crop {i + 1}/{total}")
 
-    if not examples:
-        raise ValueError("No labeled samples found")
+            if on_progress and total > 0:
+                on_progress((i + 1) / total, f"Processing crop {i + 1}/{total}")
 
     features = Features(
         {
@@ -138,13 +143,44 @@ def run_dataset(
         }
     )
 
-    ds = Dataset.from_list(examples, features=features)
-    ds.save_to_disk(str(output))
+    # Arrow shards are written incrementally; a private cache dir keeps reruns from reusing stale data
+    with tempfile.TemporaryDirectory() as cache_dir:
+        ds = Dataset.from_generator(_examples, features=features, cache_dir=cache_dir)
+        ds.save_to_disk(str(output))
 
     if on_progress:
         on_progress(1.0, f"Saved dataset to {output}")
 
 
+class _TrainTransform:
+    """Dataset transform resizing and normalizing like predict's _preprocess, built once.
+
+    Training uses the same geometry as prediction (antialiased bilinear resize straight to the processor's
+    target size, no center crop) so the model is evaluated on the inputs it was trained on.
+    A module-level class (not a closure) so it pickles into DataLoader worker processes.
+    """
+
+    def __init__(self, processor) -> None:
+        import torch
+        from torchvision.transforms import InterpolationMode
+        from torchvision.transforms import v2 as T
+
+        self.tfm = T.Compose(
+            [
+                T.PILToTensor(),
+                T.ToDtype(torch.float32, scale=True),
+                T.Resize(_processor_target_size(processor), interpolation=InterpolationMode.BILINEAR, antialias=True),
+                T.Normalize(processor.image_mean, processor.image_std),
+            ]
+        )
+
+    def __call__(self, examples: dict) -> dict:
+        import torch
+
+        pixel_values = torch.stack([self.tfm(img.convert("RGB")) for img in examples["image"]])
+        return {"pixel_values": pixel_values, "labels": examples["label"]}
+
+
 def run_train(
     dataset_path: Path,
     output: Path,
@@ -165,19 +201,6 @@ def run_train(
         TrainingArguments,
     )
 
-    def _make_transforms(processor):
-        def transforms(examples: dict) -> dict:
-            images = []
-            for img in examples["image"]:
-                if img.mode != "RGB":
-                    img = img.convert("RGB")
-                images.append(img)
-            inputs = processor(images, return_tensors="pt")
-            inputs["labels"] = examples["label"]
-            return inputs
-
-        return transforms
-
     if on_progress:
         on_progress(0.1, "Loading dataset...")
     ds = load_from_disk(str(dataset_path))
@@ -197,7 +220,7 @@ def run_train(
         ignore_mismatched_sizes=True,
     )
 
-    transform_fn = _make_transforms(processor)
+    transform_fn = _TrainTransform(processor)
     train_ds = train_ds.with_transform(transform_fn)
     val_ds = val_ds.with_transform(transform_fn)
 
@@ -211,6 +234,13 @@ def run_train(
         f1_score = f1.compute(predictions=preds, references=labels)
         return {**acc, **f1_score}
 
+    # Decode/transform in worker processes and pin batches so the host->device copy can overlap compute
+    num_workers = min(8, (os.cpu_count() or 2) // 2)
+    loader_kwargs: dict = {"dataloader_num_workers": num_workers, "dataloader_pin_memory": True}
+    if num_workers > 0:
+        loader_kwargs["dataloader_persistent_workers"] = True
+        loader_kwargs["dataloader_prefetch_factor"] = 4
+
     training_args = TrainingArguments(
         output_dir=str(output),
         num_train_epochs=epochs,
@@ -224,6 +254,7 @@ def run_train(
         logging_steps=10,
         remove_unused_columns=False,
         seed=42,
+        **loader_kwargs,
     )
 
     trainer = Trainer(
@@ -247,18 +278,194 @@ def run_train(
         on_progress(1.0, f"Model saved to {output / 'best'}")
 
 
+def _autocast(device):
+    """Mixed-precision autocast context for *device* (FP16, BF16 or none)."""
+    import contextlib
+
+    import torch
+
+    if device.type == "cpu":
+        # Emulated bf16 is slower than fp32, so only use it where oneDNN has native support (AVX512-BF16/AMX)
+        try:
+            if torch.ops.mkldnn._is_mkldnn_bf16_supported():
+                return torch.autocast(device_type="cpu", dtype=torch.bfloat16)
+        except (AttributeError, RuntimeError):
+            pass
+        return contextlib.nullcontext()
+    try:
+        return torch.autocast(device_type=device.type, dtype=torch.float16)
+    except (RuntimeError, ValueError):
+        return contextlib.nullcontext()
+
+
+def _compile_classifier(model, device, target_size: tuple[int, int], batch_size: int):
+    """Wrap *model* as pixel_values -> logits, compiled and warmed up where possible."""
+    import torch
+
+    class _Logits(torch.nn.Module):
+        def __init__(self, inner) -> None:
+            super().__init__()
+            self.inner = inner
+
+        def forward(self, pixel_values):
+            return self.inner(pixel_values=pixel_values).logits
+
+    eager = _Logits(model).eval()
+    dummy = torch.zeros((batch_size, 3, *target_size), device=device).contiguous(memory_format=torch.channels_last)
+
+    def _warmup(fn):
+        with torch.inference_mode(), _autocast(device):
+            fn(dummy)
+        return fn
+
+    try:
+        # compile is lazy: failures surface on the first call, hence the warmup inside the try
+        return _warmup(torch.compile(eager, mode="reduce-overhead", dynamic=False))
+    except Exception as e:
+        logger.warning("torch.compile failed (%s: %s); trying TorchScript", type(e).__name__, e)
+    try:
+        with torch.no_grad():
+            traced = torch.jit.trace(eager, example_inputs=dummy)
+        return _warmup(torch.jit.freeze(traced))
+    except Exception as e:
+        logger.warning("TorchScript tracing failed (%s: %s); running the model eagerly", type(e).__name__, e)
+        return eager
+
+
+def _preprocess(frames: np.ndarray, device, target_size: tuple[int, int], mean_t, std_t):
+    """Normalize (N, H, W) uint8 frames to (N, 3, h, w) pixel_values."""
+    import torch
+    import torch.nn.functional as F
+
+    x = torch.from_numpy(frames).to(device, non_blocking=True)
+    x = x.unsqueeze(1).float().div_(255)
+    x = F.interpolate(x, size=target_size, mode="bilinear", align_corners=False, antialias=True)
+    x = x.expand(-1, 3, -1, -1).sub(mean_t).div_(std_t)
+    return x.contiguous(memory_format=torch.channels_last)
+
+
+class _OrtClassifier:
+    """ONNX Runtime session called like the compiled torch model."""
+
+    def __init__(self, model_file: Path) -> None:
+        import onnxruntime as ort
+
+        opts = ort.SessionOptions()
+        opts.intra_op_num_threads = os.cpu_count() or 1
+        opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(str(model_file), sess_options=opts, providers=["CPUExecutionProvider"])
+        self.input_name = self.session.get_inputs()[0].name
+
+    def __call__(self, pixel_values):
+        import torch
+
+        x = pixel_values.float().contiguous().cpu().numpy()
+        return torch.from_numpy(self.session.run(None, {self.input_name: x})[0])
+
+
+def _onnx_model_file(model_path: str) -> Path | None:
+    """Path of a local ONNX export, else None."""
+    path = Path(model_path)
+    if path.suffix == ".onnx" and path.is_file():
+        return path
+    if (path / "model.onnx").is_file():
+        return path / "model.onnx"
+    return None
+
+
+def _quantize_int8(
+    model_file: Path,
+    zarr_path: Path,
+    pos: int,
+    target_size: tuple[int, int],
+    mean_t,
+    std_t,
+    n_calibration: int = 64,
+) -> Path:
+    """Quantize *model_file* to int8, calibrated on frames from the crops.
+
+    The quantized model depends on its calibration frames, so it is cached under a name keyed by their hash
+    (model.int8.<hash>.onnx): next to the model, or under the user cache dir if that is not writable, and
+    reused while newer than the model. A temp dir is the last resort.
+    """
+    import hashlib
+
+    import torch
+    from onnxruntime.quantization import CalibrationDataReader, QuantFormat, QuantType, quantize_static
+
+    crop_grp = open_zarr_group(zarr_path, mode="r")[f"pos/{pos:03d}/crop"]
+    crop_ids = sorted(crop_grp.keys())
+    if not crop_ids:
+        raise ValueError(f"No crops to calibrate int8 quantization for pos {pos:03d}")
+    per_crop = max(1, n_calibration // min(len(crop_ids), 8))
+    picks = crop_ids[:: max(1, len(crop_ids) // 8)][:8]
+    samples = []
+    for crop_id in picks:
+        arr = crop_grp[crop_id]
+        ts = np.unique(np.linspace(0, arr.shape[0] - 1, per_crop).astype(int))
+        block = _normalize_frames(np.asarray(arr.get_orthogonal_selection((ts, 0, 0))))
+        samples.append(_preprocess(block, torch.device("cpu"), target_size, mean_t, std_t).contiguous().numpy())
+    calibration = np.concatenate(samples)[:n_calibration]
+
+    name = f"{model_file.stem}.int8.{hashlib.sha1(calibration.tobytes()).hexdigest()[:16]}.onnx"
+    cache_root = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    key = hashlib.sha1(str(model_file.resolve()).encode()).hexdigest()[:16]
+    candidates = [model_file.with_name(name), cache_root / "mupattern" / "int8" / key / name]
+    for out in candidates:
+        if out.is_file() and out.stat().st_mtime >= model_file.stat().st_mtime:
+            return out
+
+    import onnxruntime as ort
+
+    input_name = ort.InferenceSession(str(model_file), providers=["CPUExecutionProvider"]).get_inputs()[0].name
+
+    class _Reader(CalibrationDataReader):
+        def __init__(self) -> None:
+            self.batches = iter(np.split(calibration, len(calibration)))
+
+        def get_next(self):
+            batch = next(self.batches, None)
+            return None if batch is None else {input_name: batch}
+
+    def _quantize(dest: Path) -> None:
+        quantize_static(
+            str(model_file),
+            str(dest),
+            _Reader(),
+            quant_format=QuantFormat.QDQ,
+            per_channel=True,
+            activation_type=QuantType.QUInt8,
+            weight_type=QuantType.QInt8,
+        )
+
+    for out in candidates:
+        try:
+            out.parent.mkdir(parents=True, exist_ok=True)
+            _quantize(out)
+            return out
+        except OSError as e:
+            logger.warning("Cannot write %s (%s); trying another location", out, e)
+    out = Path(tempfile.mkdtemp()) / name
+    _quantize(out)
+    return out
+
+
 def _predict_position(
     zarr_path: Path,
     pos: int,
     model,
-    processor,
     device,
+    target_size: tuple[int, int],
+    mean_t,
+    std_t,
     batch_size: int,
     t_range: tuple[int, int] | None,
     crop_range: tuple[int, int] | None,
+    writer,
     on_progress: ProgressCallback | None,
-) -> list[dict]:
-    """Run inference on (crop, t) pairs for a position."""
+) -> int:
+    """Write t,crop,label predictions for a position to *writer*. Returns the row count."""
+    import pyarrow as pa
     import torch
 
     root = open_zarr_group(zarr_path, mode="r")
@@ -268,53 +475,84 @@ def _predict_position(
     if crop_range is not None:
         crop_ids = [c for c in crop_ids if crop_range[0] <= int(c) < crop_range[1]]
 
-    results: list[dict] = []
-    batch_imgs: list[PILImage.Image] = []
-    batch_meta: list[tuple[int, str]] = []
-
-    def _run_batch(images, model, processor, device) -> list[bool]:
-        inputs = processor(images, return_tensors="pt")
-        inputs = {k: v.to(device) for k, v in inputs.items()}
-        with torch.no_grad():
-            outputs = model(**inputs)
-        preds = torch.argmax(outputs.logits, dim=-1).cpu().tolist()
-        return [bool(p) for p in preds]
-
-    total = len(crop_ids)
-    for i, crop_id in enumerate(crop_ids):
-        arr = crop_grp[crop_id]
-        n_times = arr.shape[0]
+    def _t_bounds(n_times: int) -> tuple[int, int]:
         t_start = t_range[0] if t_range else 0
         t_end = min(t_range[1], n_times) if t_range else n_times
+        return t_start, max(t_start, t_end)
 
-        for t in range(t_start, t_end):
-            frame = np.array(arr[t, 0, 0])
-            lo, hi = float(frame.min()), float(frame.max())
-            if hi > lo:
-                normalized = ((frame - lo) / (hi - lo) * 255).astype(np.uint8)
-            else:
-                normalized = np.zeros_like(frame, dtype=np.uint8)
-
-            img = PILImage.fromarray(normalized, mode="L").convert("RGB")
-            batch_imgs.append(img)
-            batch_meta.append((t, crop_id))
-
-            if len(batch_imgs) >= batch_size:
-                preds = _run_batch(batch_imgs, model, processor, device)
-                for (bt, bc), pred in zip(batch_meta, preds):
-                    results.append({"t": bt, "crop": bc, "label": pred})
-                batch_imgs.clear()
-                batch_meta.clear()
-
-        if on_progress and total > 0:
-            on_progress((i + 1) / total, f"Predicting crop {i + 1}/{total}")
-
-    if batch_imgs:
-        preds = _run_batch(batch_imgs, model, processor, device)
-        for (bt, bc), pred in zip(batch_meta, preds):
-            results.append({"t": bt, "crop": bc, "label": pred})
+    def _read(crop_id: str) -> tuple[int, int, np.ndarray | None]:
+        arr = crop_grp[crop_id]
+        t_start, t_end = _t_bounds(arr.shape[0])
+        if t_end <= t_start:
+            return t_start, t_end, None
+        return t_start, t_end, _normalize_frames(np.asarray(arr[t_start:t_end, 0, 0]))
+
+    # Batches are assembled on a producer thread (queue depth 2) while the model runs on the previous one.
+    # Each batch lives in one of a ring of preallocated slots: uint8 frames plus t/crop metadata. With two
+    # batches queued, one being filled and one in the model, a ring of depth + 2 slots is never overwritten
+    # while still in use. A slot's image buffer is reallocated only if the crop size changes.
+    depth = 2
+    ring: list[tuple[np.ndarray | None, np.ndarray, list[str | None]]] = [
+        (None, np.empty(batch_size, dtype=np.int64), [None] * batch_size) for _ in range(depth + 2)
+    ]
+    total = len(crop_ids)
 
-    return results
+    def _take_slot(slot: int, shape: tuple[int, ...]):
+        img_buf, t_buf, crop_buf = ring[slot]
+        if img_buf is None or img_buf.shape[1:] != shape:
+            img_buf = np.empty((batch_size, *shape), dtype=np.uint8)
+            ring[slot] = (img_buf, t_buf, crop_buf)
+        return img_buf, t_buf, crop_buf
+
+    def _iter_batches():
+        """Yield (frames, t, crop, n, crops_done) per batch; n == 0 is a progress tick."""
+        slot = 0
+        shape = None
+        cursor = 0
+        # The image buffer is allocated once the first crop's frame shape is known
+        img_buf, t_buf, crop_buf = ring[slot]
+        blocks = prefetch_map(_read, crop_ids)
+        for i, (crop_id, (t_start, t_end, normalized)) in enumerate(zip(crop_ids, blocks)):
+            if normalized is not None and normalized.shape[1:] != shape:
+                if cursor:
+                    yield img_buf, t_buf, crop_buf, cursor, i
+                    slot = (slot + 1) % len(ring)
+                    cursor = 0
+                shape = normalized.shape[1:]
+                img_buf, t_buf, crop_buf = _take_slot(slot, shape)
+            t = t_start
+            while t < t_end:
+                n = min(batch_size - cursor, t_end - t)
+                img_buf[cursor : cursor + n] = normalized[t - t_start : t - t_start + n]
+                t_buf[cursor : cursor + n] = np.arange(t, t + n)
+                crop_buf[cursor : cursor + n] = [crop_id] * n
+                cursor += n
+                t += n
+
+                if cursor == batch_size:
+                    yield img_buf, t_buf, crop_buf, cursor, i
+                    slot = (slot + 1) % len(ring)
+                    cursor = 0
+                    img_buf, t_buf, crop_buf = _take_slot(slot, shape)
+            yield None, None, None, 0, i + 1
+        if cursor:
+            yield img_buf, t_buf, crop_buf, cursor, total
+
+    written = 0
+    for img_buf, t_buf, crop_buf, n, crops_done in prefetch_iter(_iter_batches(), depth=depth):
+        if n:
+            # Partial batches run on the whole slot (stale rows beyond n are discarded) so every forward
+            # pass has the batch_size shape the model was compiled and warmed up for
+            x = _preprocess(img_buf, device, target_size, mean_t, std_t)
+            with torch.inference_mode(), _autocast(device):
+                logits = model(x)
+            preds = torch.argmax(logits[:n].float(), dim=-1).cpu().numpy().astype(bool)
+            writer.write_batch(pa.record_batch({"t": t_buf[:n], "crop": crop_buf[:n], "label": preds}))
+            written += n
+        elif on_progress and total > 0:
+            on_progress(crops_done / total, f"Predicting crop {crops_done}/{total}")
+
+    return written
 
 
 def run_predict(
@@ -328,17 +566,46 @@ def run_predict(
     crop_start: int | None = None,
     crop_end: int | None = None,
     *,
+    precision: str = "fp32",
     on_progress: ProgressCallback | None = None,
 ) -> None:
-    """Run inference on crops.zarr positions and write predictions CSV."""
+    """Run inference on crops.zarr positions and write predictions CSV.
+
+    With precision="int8" a local ONNX export (model.onnx + preprocessor_config.json) is quantized and run on
+    ONNX Runtime; otherwise the HuggingFace model runs in torch.
+    """
+    import pyarrow as pa
     import torch
     from transformers import AutoImageProcessor, AutoModelForImageClassification
 
-    device = torch.device("mps" if torch.backends.mps.is_available() else "cpu")
-    loaded_model = AutoModelForImageClassification.from_pretrained(str(model_path))
-    loaded_model.to(device)
-    loaded_model.eval()
-    processor = AutoImageProcessor.from_pretrained(str(model_path))
+    if precision not in ("fp32", "int8"):
+        raise ValueError(f"Unknown precision {precision!r}. Use 'fp32' or 'int8'.")
+    # ONNX Runtime is used only when int8 is requested, even if the model directory also holds an export
+    onnx_file = _onnx_model_file(model_path) if precision == "int8" else None
+    if precision == "int8" and onnx_file is None:
+        raise ValueError("int8 precision requires an ONNX export (model.onnx) of the model")
+
+    processor = AutoImageProcessor.from_pretrained(str(onnx_file.parent if onnx_file else model_path))
+    target_size = _processor_target_size(processor)
+    if onnx_file is not None:
+        device = torch.device("cpu")
+    else:
+        device = torch.device("mps" if torch.backends.mps.is_available() else "cpu")
+    mean_t = torch.tensor(processor.image_mean, dtype=torch.float32, device=device).view(1, 3, 1, 1)
+    std_t = torch.tensor(processor.image_std, dtype=torch.float32, device=device).view(1, 3, 1, 1)
+
+    if onnx_file is not None:
+        if precision == "int8":
+            if on_progress:
+                on_progress(0.0, "Quantizing model to int8")
+            onnx_file = _quantize_int8(onnx_file, zarr_path, pos, target_size, mean_t, std_t)
+        classifier = _OrtClassifier(onnx_file)
+    else:
+        loaded_model = AutoModelForImageClassification.from_pretrained(str(model_path))
+        loaded_model.to(device)
+        loaded_model.eval()
+        loaded_model = loaded_model.to(memory_format=torch.channels_last)
+        classifier = _compile_classifier(loaded_model, device, target_size, batch_size)
 
     t_range = None
     if t_start is not None and t_end is not None:
@@ -352,34 +619,38 @@ def run_predict(
     elif crop_start is not None or crop_end is not None:
         raise ValueError("Both crop_start and crop_end must be provided if using crop range")
 
-    results = _predict_position(
-        zarr_path,
-        pos,
-        loaded_model,
-        processor,
-        device,
-        batch_size,
-        t_range,
-        crop_range,
-        on_progress,
-    )
-
-    output.parent.mkdir(parents=True, exist_ok=True)
-    with open(output, "w", newline="") as fh:
-        fh.write("t,crop,label\n")
-        for r in results:
-            fh.write(f"{r['t']},{r['crop']},{str(r['label']).lower()}\n")
+    schema = pa.schema([("t", pa.int64()), ("crop", pa.string()), ("label", pa.bool_())])
+    with csv_column_writer(output, schema) as writer:
+        n_written = _predict_position(
+            zarr_path,
+            pos,
+            classifier,
+            device,
+            target_size,
+            mean_t,
+            std_t,
+            batch_size,
+            t_range,
+            crop_range,
+            writer,
+            on_progress,
+        )
 
     if on_progress:
-        on_progress(1.0, f"Wrote {len(results)} predictions to {output}")
+        on_progress(1.0, f"Wrote {n_written} predictions to {output}")
 
 
-def run_clean(input_csv: Path, output: Path) -> None:
-    """Clean predictions by enforcing monotonicity."""
-    df = _load_csv(input_csv)
+def run_clean(input_csv: Path, output: Path) -> pd.DataFrame:
+    """Clean predictions by enforcing monotonicity. Returns the corrected rows."""
+    return clean_predictions(_load_csv(input_csv), output)
+
+
+def clean_predictions(df: pd.DataFrame, output: Path) -> pd.DataFrame:
+    """Clean loaded predictions by enforcing monotonicity. Returns the corrected rows."""
     cleaned, report = _clean_df(df)
-    cleaned["label"] = cleaned["label"].apply(lambda x: "true" if x else "false")
+    cleaned["label"] = np.where(cleaned["label"].to_numpy(dtype=bool, na_value=True), "true", "false")
     cleaned.to_csv(output, index=False)
+    return report
 
 
 CLEAN_THRESHOLD = 0.8
@@ -6,10 +6,11 @@ from pathlib import Path
 
 import numpy as np
 import pandas as pd
-import zarr
 from scipy import ndimage
 
+from ...common.io_csv import write_csv_columns
 from ...common.io_zarr import open_zarr_group
+from ...common.parallel import prefetch_map, resolve_jobs, torch_threads
 from ...common.progress import ProgressCallback
 
 
@@ -56,9 +57,26 @@ def run_segment(
     output_masks: Path,
     *,
     backend: str = "cellpose",
+    jobs: int = 0,
     on_progress: ProgressCallback | None = None,
 ) -> None:
-    """Segment each crop per frame with Cellpose or CellSAM (phase + fluorescence), save masks to masks.zarr (same layout as crops)."""
+    """Segment each crop per frame with Cellpose or CellSAM and save masks to masks.zarr."""
+    # Both backends run one torch model in-process; the --jobs CPU workers are its intra-op threads
+    with torch_threads(resolve_jobs(jobs)):
+        _segment(zarr_path, pos, channel_phase, channel_fluorescence, output_masks, backend, on_progress)
+
+
+def _segment(
+    zarr_path: Path,
+    pos: int,
+    channel_phase: int,
+    channel_fluorescence: int,
+    output_masks: Path,
+    backend: str,
+    on_progress: ProgressCallback | None,
+) -> None:
+    import torch
+
     root = open_zarr_group(zarr_path, mode="r")
     crop_grp = root[f"pos/{pos:03d}/crop"]
     crop_ids = sorted(crop_grp.keys())
@@ -71,8 +89,6 @@ def run_segment(
         except Exception:
             model = CellposeModel(pretrained_model="cpsam", gpu=False)
     elif backend == "cellsam":
-        import torch
-
         from cellSAM import get_model, segment_cellular_image
 
         device = "cuda" if torch.cuda.is_available() else "cpu"
@@ -82,7 +98,7 @@ def run_segment(
     else:
         raise ValueError(f"Unknown segment backend {backend!r}. Use 'cellpose' or 'cellsam'.")
 
-    out_root = zarr.open_group(str(output_masks), mode="a", zarr_format=3)
+    out_root = open_zarr_group(output_masks, mode="a")
     pos_grp = out_root.require_group(f"pos/{pos:03d}")
     mask_crop_grp = pos_grp.require_group("crop")
 
@@ -143,6 +159,7 @@ def run_analyze(
     channel_fluorescence: int,
     output: Path,
     *,
+    jobs: int = 0,
     on_progress: ProgressCallback | None = None,
 ) -> None:
     """Load crops.zarr and masks.zarr; compute per-cell total fluorescence, cell area, background; write CSV."""
@@ -158,15 +175,17 @@ def run_analyze(
     mask_root = open_zarr_group(masks_path, mode="r")
     mask_crop_grp = mask_root[f"pos/{pos:03d}/crop"]
 
-    rows: list[tuple[int, str, int, float, int, int]] = []
+    names = ("t", "crop", "cell", "total_fluorescence", "cell_area", "background")
+    columns: dict[str, list[np.ndarray]] = {name: [] for name in names}
     n_crops = len(crop_ids)
     total_work = sum(int(crop_grp[cid].shape[0]) for cid in crop_ids)
     done = 0
 
-    for crop_idx, crop_id in enumerate(crop_ids):
+    def _measure_crop(crop_id: str) -> tuple[int, dict[str, list[np.ndarray]]]:
         crop_arr = crop_grp[crop_id]
         mask_arr = mask_crop_grp[crop_id]
         n_times = crop_arr.shape[0]
+        parts: dict[str, list[np.ndarray]] = {name: [] for name in names}
         for t in range(n_times):
             fluo = np.array(crop_arr[t, channel_fluorescence, 0], dtype=np.float64)
             masks = np.array(mask_arr[t])
@@ -174,25 +193,41 @@ def run_analyze(
                 background = int(bg_arr[t, channel_fluorescence, 0])  # crops.zarr background is uint16
             else:
                 background = int(np.median(fluo))
-            for cell_id in np.unique(masks):
-                if cell_id == 0:
-                    continue
-                cell_mask = masks == cell_id
-                total_fluorescence = float(np.sum(fluo[cell_mask]))
-                cell_area = int(np.sum(cell_mask))
-                rows.append((t, crop_id, int(cell_id), total_fluorescence, cell_area, background))
-            done += 1
-            if on_progress and total_work > 0:
-                on_progress(done / total_work, f"Crop {crop_idx + 1}/{n_crops}, frame {t + 1}/{n_times}")
-
-    output.parent.mkdir(parents=True, exist_ok=True)
-    with open(output, "w", newline="") as fh:
-        fh.write("t,crop,cell,total_fluorescence,cell_area,background\n")
-        for t, crop, cell, total_fluorescence, cell_area, background in rows:
-            fh.write(f"{t},{crop},{cell},{total_fluorescence},{cell_area},{background}\n")
+            cell_ids, cell_areas = np.unique(masks, return_counts=True)
+            keep = cell_ids != 0
+            cell_ids, cell_areas = cell_ids[keep], cell_areas[keep]
+            n_cells = len(cell_ids)
+            if n_cells:
+                sums = np.bincount(masks.ravel(), weights=fluo.ravel())[cell_ids]
+                parts["t"].append(np.full(n_cells, t, dtype=np.int64))
+                parts["crop"].append(np.full(n_cells, crop_id, dtype=object))
+                parts["cell"].append(cell_ids.astype(np.int64))
+                parts["total_fluorescence"].append(sums)
+                parts["cell_area"].append(cell_areas.astype(np.int64))
+                parts["background"].append(np.full(n_cells, background, dtype=np.int64))
+        return n_times, parts
+
+    # Crops are independent; zarr decode and the NumPy reductions release the GIL
+    results = prefetch_map(_measure_crop, crop_ids, max_workers=resolve_jobs(jobs))
+    for crop_idx, (n_times, parts) in enumerate(results):
+        for name in names:
+            columns[name].extend(parts[name])
+        done += n_times
+        if on_progress and total_work > 0:
+            on_progress(done / total_work, f"Crop {crop_idx + 1}/{n_crops}")
+
+    dtypes = {"crop": object, "total_fluorescence": np.float64}
+    write_csv_columns(
+        output,
+        {
+            name: np.concatenate(parts) if parts else np.empty(0, dtype=dtypes.get(name, np.int64))
+            for name, parts in columns.items()
+        },
+    )
 
     if on_progress:
-        on_progress(1.0, f"Wrote {len(rows)} rows to {output}")
+        n_rows = sum(len(c) for c in columns["t"])
+        on_progress(1.0, f"Wrote {n_rows} rows to {output}")
 
 
 def run_pipeline(
@@ -204,6 +239,7 @@ def run_pipeline(
     method: str = "cellpose",
     channel_phase: int | None = None,
     masks_path: Path | None = None,
+    jobs: int = 0,
     on_progress: ProgressCallback | None = None,
 ) -> None:
     """Run segment then analyze: write masks, then CSV. masks_path defaults to output.parent / masks.zarr."""
@@ -219,6 +255,7 @@ def run_pipeline(
             channel_fluorescence,
             masks,
             backend=method,
+            jobs=jobs,
             on_progress=lambda p, m: on_progress(p * 0.5, m) if on_progress else None,
         )
     else:
@@ -230,6 +267,7 @@ def run_pipeline(
         pos,
         channel_fluorescence,
         output,
+        jobs=jobs,
         on_progress=lambda p, m: on_progress(0.5 + p * 0.5, m) if on_progress else None,
     )
 
@@ -7,9 +7,8 @@ from typing import Annotated
 
 import typer
 
-from ..common.progress import progress_json_stderr
-from ..common.slices import parse_slice_string
-from ..apps.convert.core import run_convert
+from ..common.progress import make_throttled_progress, progress_json_stderr
+from ..common.slices import SliceSpec
 
 app = typer.Typer(
     add_completion=False,
@@ -53,43 +52,55 @@ def convert(
     """Convert an ND2 file into per-position TIFF folders."""
     import nd2
 
-    f = nd2.ND2File(str(input))
-    sizes = f.sizes
-    n_pos = sizes.get("P", 1)
-    n_time = sizes.get("T", 1)
-    n_chan = sizes.get("C", 1)
-    n_z = sizes.get("Z", 1)
-    f.close()
+    from ..apps.convert.core import run_convert
 
-    try:
-        pos_indices = parse_slice_string(pos, n_pos)
-        time_indices = parse_slice_string(time, n_time)
-    except ValueError as e:
-        raise typer.BadParameter(str(e)) from e
+    with nd2.ND2File(str(input)) as f:
+        sizes = f.sizes
+        n_pos = sizes.get("P", 1)
+        n_time = sizes.get("T", 1)
+        n_chan = sizes.get("C", 1)
+        n_z = sizes.get("Z", 1)
 
-    total = len(pos_indices) * len(time_indices) * n_chan * n_z
+        try:
+            pos_spec = SliceSpec.parse(pos, n_pos)
+            time_spec = SliceSpec.parse(time, n_time)
+        except ValueError as e:
+            raise typer.BadParameter(str(e)) from e
+        pos_indices = list(pos_spec.indices)
+        time_indices = list(time_spec.indices)
 
-    typer.echo(f"ND2: {n_pos} positions, T={n_time}, C={n_chan}, Z={n_z}")
-    typer.echo("")
-    typer.echo(
-        f"Selected {len(pos_indices)}/{n_pos} positions, "
-        f"{len(time_indices)}/{n_time} timepoints, "
-        f"{n_chan} channels, {n_z} z-slices"
-    )
-    typer.echo(f"Total frames to write: {total}")
-    typer.echo("")
-    typer.echo("Positions:")
-    typer.echo(f"  {', '.join(f'Pos{i}' for i in pos_indices)}")
-    typer.echo("")
-    typer.echo("Timepoints (original indices):")
-    typer.echo(f"  {time_indices}")
-    typer.echo("")
+        total = len(pos_indices) * len(time_indices) * n_chan * n_z
 
-    if not yes and not typer.confirm("Proceed with conversion?"):
-        raise typer.Abort()
+        # One write for the whole preview; the position/time lists can run to thousands of entries
+        preview = [
+            f"ND2: {n_pos} positions, T={n_time}, C={n_chan}, Z={n_z}",
+            "",
+            f"Selected {len(pos_indices)}/{n_pos} positions, "
+            f"{len(time_indices)}/{n_time} timepoints, "
+            f"{n_chan} channels, {n_z} z-slices",
+            f"Total frames to write: {total}",
+            "",
+            "Positions:",
+            "  " + ", ".join(map("Pos{}".format, pos_indices)),
+            "",
+            "Timepoints (original indices):",
+            f"  {time_indices}",
+            "",
+        ]
+        typer.echo("\n".join(preview))
 
-    try:
-        run_convert(input, pos, time, output, on_progress=progress_json_stderr)
-    except ValueError as e:
-        typer.echo(f"Error: {e}", err=True)
-        raise typer.Exit(code=1) from e
+        if not yes and not typer.confirm("Proceed with conversion?"):
+            raise typer.Abort()
+
+        try:
+            run_convert(
+                input,
+                pos_spec,
+                time_spec,
+                output,
+                nd2_file=f,
+                on_progress=make_throttled_progress(progress_json_stderr),
+            )
+        except ValueError as e:
+            typer.echo(f"Error: {e}", err=True)
+            raise typer.Exit(code=1) from e
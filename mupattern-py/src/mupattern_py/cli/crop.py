@@ -7,8 +7,7 @@ from typing import Annotated
 
 import typer
 
-from ..common.progress import progress_json_stderr
-from ..apps.crop.core import _read_bbox_csv, run_crop
+from ..common.progress import make_throttled_progress, progress_json_stderr
 
 
 def crop(
@@ -37,15 +36,29 @@ def crop(
         Path,
         typer.Option(help="Output zarr store path (e.g. crops.zarr)."),
     ],
+    jobs: Annotated[
+        int,
+        typer.Option("--jobs", help="Parallel CPU workers (0 = min(8, cores))."),
+    ],
     background: Annotated[
         bool,
         typer.Option("--background/--no-background", help="Compute per-frame background (median outside crops)."),
     ] = False,
 ) -> None:
     """Crop pattern positions from microscopy TIFFs into a zarr store."""
+    from ..apps.crop.core import _read_bbox_csv, run_crop
+
     _read_bbox_csv(bbox)
     try:
-        run_crop(input_dir, pos, bbox, output, background, on_progress=progress_json_stderr)
+        run_crop(
+            input_dir,
+            pos,
+            bbox,
+            output,
+            background,
+            jobs=jobs,
+            on_progress=make_throttled_progress(progress_json_stderr),
+        )
     except (FileNotFoundError, ValueError) as e:
         typer.echo(f"Error: {e}", err=True)
         raise typer.Exit(code=1) from e
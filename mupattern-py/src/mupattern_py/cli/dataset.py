@@ -7,8 +7,6 @@ from typing import Annotated
 
 import typer
 
-from ..apps.kill.core import _load_annotations, run_dataset
-
 
 def _progress_echo(progress: float, message: str) -> None:
     typer.echo(message)
@@ -42,6 +40,8 @@ def kill(
     ],
 ) -> None:
     """Create a HuggingFace Dataset from crops.zarr + annotations CSV for kill-curve training."""
+    from ..apps.kill.core import _load_annotations, run_dataset
+
     try:
         typer.echo(f"Loading pos {pos} from {input}")
         ann_dict = _load_annotations(annotations)
@@ -7,8 +7,7 @@ from typing import Annotated
 
 import typer
 
-from ..common.progress import progress_json_stderr
-from ..apps.expression.core import run_analyze
+from ..common.progress import make_throttled_progress, progress_json_stderr
 
 
 def expression(
@@ -21,4 +20,6 @@ def expression(
     output: Annotated[Path, typer.Option(help="Output CSV file path.")],
 ) -> None:
     """Sum pixel intensities per crop per timepoint and write a CSV."""
-    run_analyze(input, pos, channel, output, on_progress=progress_json_stderr)
+    from ..apps.expression.core import run_analyze
+
+    run_analyze(input, pos, channel, output, on_progress=make_throttled_progress(progress_json_stderr))
@@ -7,8 +7,6 @@ from typing import Annotated
 
 import typer
 
-from ..apps.kill.core import _find_violations, _load_csv, run_clean, run_predict
-
 
 def _progress_echo(progress: float, message: str) -> None:
     typer.echo(message)
@@ -33,6 +31,13 @@ def kill(
         Path,
         typer.Option(help="Output CSV file path."),
     ],
+    precision: Annotated[
+        str,
+        typer.Option(
+            "--precision",
+            help="fp32, or int8 to quantize an ONNX export (model.onnx) and run it on ONNX Runtime.",
+        ),
+    ],
     batch_size: Annotated[
         int,
         typer.Option("--batch-size", help="Inference batch size."),
@@ -55,6 +60,8 @@ def kill(
     ] = None,
 ) -> None:
     """Run inference on crops.zarr positions and write predictions CSV."""
+    from ..apps.kill.core import _find_violations, _load_csv, clean_predictions, run_predict
+
     try:
         t_range = None
         if t_start is not None and t_end is not None:
@@ -84,6 +91,7 @@ def kill(
             t_end=t_end,
             crop_start=crop_start,
             crop_end=crop_end,
+            precision=precision,
             on_progress=_progress_echo,
         )
 
@@ -92,18 +100,17 @@ def kill(
         df = _load_csv(output)
         violations = _find_violations(df)
         n_violations = len(violations)
-        noisy_crops = violations["crop"].unique() if n_violations > 0 else []
 
         if n_violations == 0:
             typer.echo("No monotonicity violations, output is clean.")
         else:
-            typer.echo(f"Found {n_violations} violations across {len(noisy_crops)} crops:")
-            for crop_id in sorted(noisy_crops):
-                crop_violations = violations[violations["crop"] == crop_id]
-                ts = sorted(crop_violations["t"].tolist())
+            # _find_violations returns rows sorted by (crop, t), so each list is already in t order
+            per_crop = violations.groupby("crop", sort=True)["t"].agg(list)
+            typer.echo(f"Found {n_violations} violations across {len(per_crop)} crops:")
+            for crop_id, ts in per_crop.items():
                 typer.echo(f"  crop {crop_id}: resurrects at t={ts}")
-            typer.echo(f"Corrected {len(violations)} rows (forced to absent)")
-            run_clean(output, output)
+            typer.echo(f"Corrected {n_violations} rows (forced to absent)")
+            clean_predictions(df, output)
             typer.echo(f"Wrote cleaned output to {output}")
     except ValueError as e:
         typer.echo(f"Error: {e}", err=True)
@@ -7,8 +7,7 @@ from typing import Annotated, Literal
 
 import typer
 
-from ..common.progress import progress_json_stderr
-from ..apps.crop.core import run_movie
+from ..common.progress import make_throttled_progress, progress_json_stderr
 
 
 def movie(
@@ -31,6 +30,10 @@ def movie(
         ),
     ],
     output: Annotated[Path, typer.Option(help="Output movie file path (e.g. movie.mp4).")],
+    jobs: Annotated[
+        int,
+        typer.Option("--jobs", help="Parallel CPU workers (0 = min(8, cores))."),
+    ],
     fps: Annotated[int, typer.Option(help="Frames per second.")] = 10,
     colormap: Annotated[
         Literal["grayscale", "hot", "viridis"],
@@ -42,10 +45,13 @@ def movie(
     ] = None,
 ) -> None:
     """Create a movie from a zarr crop."""
+    from ..apps.crop.core import run_movie
+
     try:
         run_movie(
             input, pos, crop, channel, time, output, fps, colormap, spots,
-            on_progress=progress_json_stderr,
+            jobs=jobs,
+            on_progress=make_throttled_progress(progress_json_stderr),
         )
     except ValueError as e:
         typer.echo(f"Error: {e}", err=True)
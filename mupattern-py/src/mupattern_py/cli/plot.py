@@ -7,11 +7,6 @@ from typing import Annotated
 
 import typer
 
-from ..apps.expression.core import run_plot as run_expression_plot
-from ..apps.kill.core import _find_violations, _load_csv as _load_kill_csv, run_plot as run_kill_plot
-from ..apps.spot.core import run_plot as run_spot_plot
-from ..apps.tissue.core import run_plot as run_tissue_plot
-
 app = typer.Typer(
     add_completion=False,
     help="Plot outputs from analyze commands (expression, kill, spot, tissue).",
@@ -32,6 +27,8 @@ def expression(
     output: Annotated[Path, typer.Option(help="Output plot image path (e.g. Pos0_expression.png).")],
 ) -> None:
     """Plot background-corrected total fluor per crop (matches desktop ExpressionTab)."""
+    from ..apps.expression.core import run_plot as run_expression_plot
+
     run_expression_plot(input, output)
     typer.echo(f"Saved plot to {output}")
 
@@ -54,6 +51,8 @@ def kill(
     ] = 5,
 ) -> None:
     """Plot kill curve (n alive) and death time distribution. Uses same clean logic as desktop KillTab."""
+    from ..apps.kill.core import _find_violations, _load_csv as _load_kill_csv, run_plot as run_kill_plot
+
     df = _load_kill_csv(input)
     typer.echo(f"Loaded {len(df)} predictions, {df['crop'].nunique()} crops, t=0..{df['t'].max()}")
     run_kill_plot(input, output, bin_width=bin_width)
@@ -77,6 +76,8 @@ def spot(
     output: Annotated[Path, typer.Option(help="Output plot image path (e.g. spots.png).")],
 ) -> None:
     """Plot spot count over time for every crop."""
+    from ..apps.spot.core import run_plot as run_spot_plot
+
     run_spot_plot(input, output)
     typer.echo(f"Saved plot to {output}")
 
@@ -99,5 +100,7 @@ def tissue(
     ],
 ) -> None:
     """Plot GFP+ count and median fluorescence per crop over time."""
+    from ..apps.tissue.core import run_plot as run_tissue_plot
+
     run_tissue_plot(input, output, gfp_threshold)
     typer.echo(f"Saved plots to {output / 'gfp_count.png'} and {output / 'median_fluorescence.png'}")
@@ -7,8 +7,6 @@ from typing import Annotated
 
 import typer
 
-from ..apps.spot.core import run_detect
-
 
 def _progress_echo(progress: float, message: str) -> None:
     typer.echo(message)
@@ -41,8 +39,25 @@ def spot(
         str,
         typer.Option(help="Spotiflow pretrained model name."),
     ],
+    precision: Annotated[
+        str,
+        typer.Option("--precision", help="fp32, or fp16 for half-precision inference on a CUDA/MPS GPU."),
+    ],
+    skip_threshold: Annotated[
+        float,
+        typer.Option(
+            "--skip-threshold",
+            help="Skip frames whose maximum intensity is at or below this value (0 skips only all-black frames).",
+        ),
+    ],
+    jobs: Annotated[
+        int,
+        typer.Option("--jobs", help="Parallel CPU workers (0 = min(8, cores))."),
+    ],
 ) -> None:
     """Detect spots per crop per timepoint and write a CSV."""
+    from ..apps.spot.core import run_detect
+
     try:
         typer.echo(f"Loading spotiflow model '{model}'...")
         typer.echo(f"Processing pos {pos:03d}, channel {channel} from {input}")
@@ -53,6 +68,9 @@ def spot(
             output,
             crop_slice=crop,
             model=model,
+            precision=precision,
+            skip_threshold=skip_threshold,
+            jobs=jobs,
             on_progress=_progress_echo,
         )
         typer.echo(f"Wrote {output}")
@@ -7,8 +7,6 @@ from typing import Annotated
 
 import typer
 
-from ..apps.tissue.core import run_pipeline
-
 
 def _progress_echo(progress: float, message: str) -> None:
     typer.echo(message)
@@ -31,13 +29,20 @@ def tissue(
         Path,
         typer.Option("--output", help="Output CSV path (t,crop,cell,total_fluorescence,cell_area,background)."),
     ],
+    jobs: Annotated[
+        int,
+        typer.Option("--jobs", help="Parallel CPU workers (0 = min(8, cores))."),
+    ],
     method: Annotated[
         str,
         typer.Option("--method", help="Segment method: 'cellpose' | 'cellsam'."),
     ] = "cellpose",
     channel_phase: Annotated[
         int | None,
-        typer.Option("--channel-phase", help="Channel index for phase contrast (required when method=cellpose or method=cellsam)."),
+        typer.Option(
+            "--channel-phase",
+            help="Channel index for phase contrast (required when method=cellpose or method=cellsam).",
+        ),
     ] = None,
     masks: Annotated[
         Path | None,
@@ -45,6 +50,8 @@ def tissue(
     ] = None,
 ) -> None:
     """Run segment then analyze: write masks.zarr, then tissue CSV."""
+    from ..apps.tissue.core import run_pipeline
+
     try:
         run_pipeline(
             input,
@@ -54,6 +61,7 @@ def tissue(
             method=method,
             channel_phase=channel_phase,
             masks_path=masks,
+            jobs=jobs,
             on_progress=_progress_echo,
         )
         typer.echo(f"Wrote masks and {output}")
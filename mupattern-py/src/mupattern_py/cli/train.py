@@ -7,8 +7,6 @@ from typing import Annotated
 
 import typer
 
-from ..apps.kill.core import run_train
-
 
 def _progress_echo(progress: float, message: str) -> None:
     typer.echo(message)
@@ -55,6 +53,8 @@ def train_kill(
     ],
 ) -> None:
     """Train a ResNet-18 binary classifier for kill-curve inference."""
+    from ..apps.kill.core import run_train
+
     run_train(dataset, output, epochs, batch_size, lr, split, on_progress=_progress_echo)
     typer.echo(f"Model saved to {output / 'best'}")
 
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+import os
+import re
+from functools import lru_cache
+from pathlib import Path
+
+
+# Exactly the names f"Pos{pos}" produces: no zero padding, so each position maps to one directory
+_POS_DIR = re.compile(r"Pos(0|[1-9][0-9]*)")
+
+
+@lru_cache(maxsize=8)
+def _scan_pos_dirs(root: str, mtime_ns: int) -> dict[int, Path]:
+    with os.scandir(root) as it:
+        return {int(e.name[3:]): Path(e.path) for e in it if _POS_DIR.fullmatch(e.name) and e.is_dir()}
+
+
+def list_pos_dirs(root: Path) -> dict[int, Path]:
+    """Return {position: path} for the Pos<N>/ subdirectories of *root*."""
+    return _scan_pos_dirs(str(root), os.stat(root).st_mtime_ns)
@@ -1,13 +1,97 @@
 from __future__ import annotations
 
-import csv
+import os
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Iterable
 
+_WRITE_BUFFER = 1 << 20
 
-def write_csv_rows(path: Path, header: list[str], rows: Iterable[Iterable[object]]) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with open(path, "w", newline="") as fh:
-        writer = csv.writer(fh)
-        writer.writerow(header)
-        writer.writerows(rows)
+
+def _ensure_parent(path: Path) -> None:
+    if not path.parent.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+
+@contextmanager
+def _open_replacing(path: Path) -> Iterator:
+    """Write to a temp file and move it onto *path* on success.
+
+    A failed run leaves any previous file untouched instead of a truncated but well-formed CSV.
+    """
+    _ensure_parent(path)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, "wb", buffering=_WRITE_BUFFER) as fh:
+            yield fh
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def _arrow_write_options():
+    import pyarrow.csv as pacsv
+
+    # Header is written by hand: Arrow always quotes it, and downstream readers split lines on ","
+    return pacsv.WriteOptions(include_header=False, quoting_style="none")
+
+
+def _check_names(names: list[str]) -> None:
+    """Raise ValueError for a header name that would need quoting."""
+    for name in names:
+        if any(ch in name for ch in ',"\r\n'):
+            raise ValueError(f"CSV column name {name!r} contains a comma, quote or newline")
+
+
+def _check_values(data) -> None:
+    """Raise ValueError for a string cell that would need quoting."""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    for name, column in zip(data.schema.names, data.columns):
+        if pa.types.is_string(column.type) or pa.types.is_large_string(column.type):
+            if pc.any(pc.match_substring_regex(column, r'[,"\r\n]')).as_py():
+                raise ValueError(f"CSV column {name!r} has a value containing a comma, quote or newline")
+
+
+class _CheckedWriter:
+    """CSVWriter wrapper that rejects string values the unquoted output cannot represent."""
+
+    def __init__(self, writer) -> None:
+        self._writer = writer
+
+    def write_batch(self, batch) -> None:
+        _check_values(batch)
+        self._writer.write_batch(batch)
+
+    def write(self, data) -> None:
+        _check_values(data)
+        self._writer.write(data)
+
+
+def write_csv_columns(path: Path, columns: Mapping[str, object]) -> None:
+    """Write equal-length columns as CSV."""
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+
+    table = pa.table(dict(columns))
+    _check_names(table.column_names)
+    _check_values(table)
+    with _open_replacing(path) as fh:
+        fh.write((",".join(table.column_names) + "\n").encode())
+        pacsv.write_csv(table, fh, write_options=_arrow_write_options())
+
+
+@contextmanager
+def csv_column_writer(path: Path, schema) -> Iterator:
+    """Open a CSV writer for *schema* that appends record batches.
+
+    Rows go to a temp file that replaces *path* when the block exits without an error.
+    """
+    import pyarrow.csv as pacsv
+
+    _check_names(schema.names)
+    with _open_replacing(path) as fh:
+        fh.write((",".join(schema.names) + "\n").encode())
+        with pacsv.CSVWriter(fh, schema, write_options=_arrow_write_options()) as writer:
+            yield _CheckedWriter(writer)
@@ -1,10 +1,20 @@
 from __future__ import annotations
 
+import os
+from functools import cache
 from pathlib import Path
 
 import zarr
 
 
+@cache
+def _configure_zarr() -> None:
+    """Scale zarr's in-flight chunk I/O with the core count (applied once per process)."""
+    cpus = os.cpu_count() or 1
+    zarr.config.set({"async.concurrency": max(zarr.config.get("async.concurrency"), 2 * cpus)})
+
+
 def open_zarr_group(path: Path | str, mode: str = "r") -> zarr.Group:
     """Open Zarr group. Only accepts Zarr v3 format."""
+    _configure_zarr()
     return zarr.open_group(str(path), mode=mode, zarr_format=3)
@@ -5,14 +5,60 @@ from __future__ import annotations
 import numpy as np
 
 
-def read_frame_2d(f, p: int, t: int, c: int, z: int) -> np.ndarray:
+class ND2Indexer:
+    """Map (p, t, c, z) to ND2 sequence indices."""
+
+    def __init__(self, f) -> None:
+        self.f = f
+        sizes = f.sizes
+        dim_order = [d for d in sizes.keys() if d not in ("Y", "X")]
+        strides: dict[str, int] = {}
+        step = 1
+        for d in reversed(dim_order):
+            strides[d] = step
+            step *= sizes[d]
+        self.stride_p = strides.get("P", 0)
+        self.stride_t = strides.get("T", 0)
+        self.stride_c = strides.get("C", 0)
+        self.stride_z = strides.get("Z", 0)
+
+    def seq_index(self, p: int, t: int, c: int, z: int) -> int:
+        return p * self.stride_p + t * self.stride_t + c * self.stride_c + z * self.stride_z
+
+    def read(self, p: int, t: int, c: int, z: int, out: np.ndarray | None = None) -> np.ndarray:
+        """Read 2D Y×X frame at (p, t, c, z). Returns one channel (first if multi-component).
+
+        Without *out* the result may be a view into the file's memory map; with *out* it is copied there.
+        """
+        frame = self.f.read_frame(self.seq_index(p, t, c, z))
+        if frame.ndim == 3:
+            frame = frame[0]  # first channel if C×Y×X
+        if out is None:
+            return np.asarray(frame)
+        np.copyto(out, frame)
+        return out
+
+
+def read_frame_2d(f, p: int, t: int, c: int, z: int, out: np.ndarray | None = None) -> np.ndarray:
     """Read 2D Y×X frame at (p, t, c, z). Returns one channel (first if multi-component)."""
+    return ND2Indexer(f).read(p, t, c, z, out=out)
+
+
+def read_position_block(f, p: int, t_indices, out: np.ndarray | None = None) -> np.ndarray:
+    """Read timepoints *t_indices* at position *p* as a (T, C, Z, Y, X) array.
+
+    Frames are copied in ND2 sequence order into one preallocated block (or *out*), so a run of
+    timepoints is a single forward pass over the file instead of scattered per-frame reads.
+    """
+    indexer = ND2Indexer(f)
     sizes = f.sizes
-    dim_order = [d for d in sizes.keys() if d not in ("Y", "X")]
-    coord_shape = tuple(sizes[d] for d in dim_order)
-    idx = tuple({"P": p, "T": t, "C": c, "Z": z}.get(d, 0) for d in dim_order)
-    seq_index = int(np.ravel_multi_index(idx, coord_shape))
-    frame = f.read_frame(seq_index)
-    if frame.ndim == 3:
-        return frame[0]  # first channel if C×Y×X
-    return np.asarray(frame)
+    n_chan = sizes.get("C", 1)
+    n_z = sizes.get("Z", 1)
+    t_indices = list(t_indices)
+    if out is None:
+        out = np.empty((len(t_indices), n_chan, n_z, sizes.get("Y", 1), sizes.get("X", 1)), dtype=f.dtype)
+    frames = [(i, t, c, z) for i, t in enumerate(t_indices) for c in range(n_chan) for z in range(n_z)]
+    frames.sort(key=lambda k: indexer.seq_index(p, k[1], k[2], k[3]))
+    for i, t, c, z in frames:
+        indexer.read(p, t, c, z, out=out[i, c, z])
+    return out
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import os
+import queue
+import threading
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def default_workers() -> int:
+    """Thread count for I/O-bound pools (zarr/TIFF decode releases the GIL)."""
+    return min(8, os.cpu_count() or 1)
+
+
+def resolve_jobs(jobs: int | None) -> int:
+    """Worker count for a user-facing --jobs value (0 or None = auto)."""
+    return jobs if jobs and jobs > 0 else default_workers()
+
+
+@contextmanager
+def torch_threads(n: int) -> Iterator[None]:
+    """Run the block with *n* torch threads."""
+    import torch
+
+    previous = torch.get_num_threads()
+    torch.set_num_threads(n)
+    try:
+        yield
+    finally:
+        torch.set_num_threads(previous)
+
+
+def _bounded_map(pool: Executor, fn: Callable[[T], R], items: Iterable[T], depth: int) -> Iterator[R]:
+    it = iter(items)
+    pending: deque[Future[R]] = deque()
+    for item in it:
+        pending.append(pool.submit(fn, item))
+        if len(pending) >= depth:
+            break
+    while pending:
+        result = pending.popleft().result()
+        for item in it:
+            pending.append(pool.submit(fn, item))
+            break
+        yield result
+
+
+def prefetch_map(
+    fn: Callable[[T], R],
+    items: Iterable[T],
+    *,
+    max_workers: int | None = None,
+    depth: int | None = None,
+    executor: Executor | None = None,
+) -> Iterator[R]:
+    """Ordered map(fn, items) on a pool, keeping at most *depth* results in flight.
+
+    Uses a private thread pool unless *executor* is given (e.g. a ProcessPoolExecutor for CPU-bound work).
+    """
+    workers = max_workers or default_workers()
+    depth = depth or 2 * workers
+    if executor is not None:
+        yield from _bounded_map(executor, fn, items, depth)
+        return
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        yield from _bounded_map(pool, fn, items, depth)
+
+
+def prefetch_iter(items: Iterable[T], depth: int = 2) -> Iterator[T]:
+    """Iterate *items* on a background thread, up to *depth* values ahead.
+
+    Exceptions from the producer are re-raised in the consumer; closing the iterator early stops the producer.
+    """
+    ready: queue.Queue = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    done = object()
+
+    def _put(value) -> bool:
+        while not stop.is_set():
+            try:
+                ready.put(value, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce() -> None:
+        try:
+            for item in items:
+                if not _put((item, None)):
+                    return
+            _put((done, None))
+        except BaseException as exc:
+            _put((done, exc))
+
+    thread = threading.Thread(target=_produce, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item, exc = ready.get()
+            if exc is not None:
+                raise exc
+            if item is done:
+                return
+            yield item
+    finally:
+        stop.set()
+        thread.join()
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import json
 import sys
+import threading
+import time
 from collections.abc import Callable
 
 ProgressCallback = Callable[[float, str], None]
@@ -9,4 +11,31 @@ ProgressCallback = Callable[[float, str], None]
 
 def progress_json_stderr(progress: float, message: str) -> None:
     """Emit progress as JSON line to stderr, matching mupattern-rs output pattern."""
-    print(json.dumps({"progress": progress, "message": message}), file=sys.stderr, flush=True)
+    line = '{"progress": %r, "message": %s}\n' % (float(progress), json.dumps(message))
+    buffer = getattr(sys.stderr, "buffer", None)
+    if buffer is None:  # stderr replaced by a text-only stream
+        sys.stderr.write(line)
+        sys.stderr.flush()
+        return
+    buffer.write(line.encode())
+    buffer.flush()
+
+
+def make_throttled_progress(callback: ProgressCallback, min_interval: float = 0.05) -> ProgressCallback:
+    """Wrap *callback* to drop ticks closer than *min_interval* seconds apart.
+
+    The first tick and any tick at progress >= 1.0 always pass.
+    """
+    lock = threading.Lock()
+    last_emit = -float("inf")
+
+    def _throttled(progress: float, message: str) -> None:
+        nonlocal last_emit
+        now = time.monotonic()
+        with lock:
+            if progress < 1.0 and now - last_emit < min_interval:
+                return
+            last_emit = now
+        callback(progress, message)
+
+    return _throttled
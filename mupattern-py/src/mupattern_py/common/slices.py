@@ -1,33 +1,111 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Below this many indices a Python set is faster than building NumPy arrays
+_NUMPY_MIN_INDICES = 100
+
+
+@dataclass(frozen=True, slots=True)
+class SliceSpec:
+    """A slice string resolved to sorted indices."""
+
+    indices: tuple[int, ...]
+
+    @classmethod
+    def parse(cls, s: str, length: int) -> SliceSpec:
+        return cls(_parse_slice_cached(s, length))
+
 
 def parse_slice_string(s: str, length: int) -> list[int]:
     """Parse slice expressions like 'all', '1,3', '0:10:2'."""
+    return list(_parse_slice_cached(s, length))
+
+
+@lru_cache(maxsize=128)
+def _parse_slice_cached(s: str, length: int) -> tuple[int, ...]:
+    """Sorted unique indices for slice string *s*, memoized."""
     if s.strip().lower() == "all":
-        return list(range(length))
+        return tuple(range(length))
 
-    indices: set[int] = set()
-    for segment in s.split(","):
-        segment = segment.strip()
-        if not segment:
-            continue
+    segments = s.split(",")
+    if ":" not in s:
+        # Plain index lists (possibly thousands long): int() strips whitespace itself, so convert in one C-level map.
+        # Empty, malformed or out-of-range entries fall through to the per-segment loop, which reports them.
         try:
-            if ":" in segment:
-                parts = [(int(p) if p else None) for p in segment.split(":")]
-                if len(parts) == 3 and parts[2] == 0:
-                    raise ValueError(f"Slice step cannot be zero: {segment!r}")
-                indices.update(range(*slice(*parts).indices(length)))
-            else:
-                idx = int(segment)
-                if idx < -length or idx >= length:
-                    raise ValueError(f"Index {idx} out of range for length {length}")
-                indices.add(idx % length)
-        except ValueError as e:
-            if "out of range" in str(e) or "cannot be zero" in str(e):
-                raise
-            raise ValueError(f"Invalid slice segment: {segment!r}") from e
-
-    if not indices:
+            scalars = list(map(int, segments))
+        except ValueError:
+            scalars = None
+        if scalars and -length <= min(scalars) and max(scalars) < length:
+            if len(scalars) < _NUMPY_MIN_INDICES:
+                return tuple(sorted({i % length for i in scalars}))
+            import numpy as np
+
+            return _sorted_unique(np.array(scalars, dtype=np.int64) % length)
+
+    # Each segment becomes a range (O(1) whatever its width); they are only expanded once the total is known
+    ranges: list[range] = []
+    for segment in segments:
+        segment = segment.strip()
+        if segment:
+            ranges.append(_parse_segment(segment, length))
+
+    total = sum(len(r) for r in ranges)
+    if total == 0:
         raise ValueError(f"Slice string {s!r} produced no indices")
+    if total < _NUMPY_MIN_INDICES:
+        return tuple(sorted(set().union(*ranges)))
+
+    # Wide selections: arange per segment (C-level); numpy is imported here so CLI startup does not load it
+    import numpy as np
+
+    return _sorted_unique(np.concatenate([np.arange(r.start, r.stop, r.step, dtype=np.int64) for r in ranges]))
+
+
+def _parse_int(text: str, segment: str) -> int:
+    """Integer value of *text* (one number of *segment*), or ValueError naming the segment."""
+    stripped = text.strip()
+    digits = stripped[1:] if stripped[:1] in "+-" else stripped
+    if digits.isascii() and digits.isdigit():
+        return int(stripped)
+    try:
+        return int(stripped)  # rarer spellings int() also accepts, e.g. 1_000
+    except ValueError:
+        raise ValueError(f"Invalid slice segment: {segment!r}") from None
+
+
+def _parse_segment(segment: str, length: int) -> range:
+    """Indices selected by one segment ('3', '-1' or '0:10:2')."""
+    if ":" not in segment:
+        idx = _parse_int(segment, segment)
+        if idx < -length or idx >= length:
+            raise ValueError(f"Index {idx} out of range for length {length}")
+        return range(idx % length, idx % length + 1)
+
+    parts = segment.split(":")
+    if len(parts) > 3:
+        raise ValueError(f"Invalid slice segment: {segment!r}")
+    bounds = [_parse_int(p, segment) if p else None for p in parts]
+    if len(bounds) == 3 and bounds[2] == 0:
+        raise ValueError(f"Slice step cannot be zero: {segment!r}")
+    return range(*slice(*bounds).indices(length))
+
+
+def _sorted_unique(indices: np.ndarray) -> tuple[int, ...]:
+    """Sorted unique values of *idx*."""
+    import numpy as np
+
+    indices = np.sort(indices)
+    return tuple(indices[np.concatenate(([True], indices[1:] != indices[:-1]))].tolist())
+
 
-    return sorted(indices)
+def resolve_slice(spec: str | SliceSpec, length: int) -> list[int]:
+    """Indices for *spec*: parse a slice string, or take a SliceSpec's indices as-is."""
+    if isinstance(spec, SliceSpec):
+        return list(spec.indices)
+    return parse_slice_string(spec, length)
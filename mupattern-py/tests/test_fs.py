@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from mupattern_py.common.fs import list_pos_dirs
+
+
+def test_list_pos_dirs_matches_unpadded_names_only(tmp_path: Path) -> None:
+    for name in ("Pos0", "Pos10", "Pos010", "Pos00", "Posx", "pos3"):
+        (tmp_path / name).mkdir()
+    (tmp_path / "Pos7").touch()
+    assert list_pos_dirs(tmp_path) == {0: tmp_path / "Pos0", 10: tmp_path / "Pos10"}
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import csv
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+
+from mupattern_py.common.io_csv import csv_column_writer, write_csv_columns  # noqa: E402
+
+
+def test_write_csv_columns_round_trip(tmp_path: Path) -> None:
+    path = tmp_path / "out" / "table.csv"
+    write_csv_columns(
+        path,
+        {
+            "t": np.array([0, 1, 2], dtype=np.int64),
+            "crop": ["000", "007", "120"],
+            "intensity": np.array([9.5, 68894.0, 0.125]),
+            "present": [True, False, True],
+        },
+    )
+    text = path.read_text()
+    assert text == "t,crop,intensity,present\n0,000,9.5,true\n1,007,68894,false\n2,120,0.125,true\n"
+    with open(path, newline="") as fh:
+        rows = list(csv.DictReader(fh))
+    assert [r["crop"] for r in rows] == ["000", "007", "120"]
+    assert [float(r["intensity"]) for r in rows] == [9.5, 68894.0, 0.125]
+
+
+def test_csv_column_writer_streams_batches(tmp_path: Path) -> None:
+    path = tmp_path / "spots.csv"
+    schema = pa.schema([("t", pa.int64()), ("crop", pa.string()), ("y", pa.float64())])
+    with csv_column_writer(path, schema) as writer:
+        writer.write_batch(pa.record_batch({"t": [0, 0], "crop": ["001", "001"], "y": [1.25, 3.0]}, schema=schema))
+        writer.write(pa.table({"t": [4], "crop": ["002"], "y": [0.5]}, schema=schema))
+    assert path.read_text() == "t,crop,y\n0,001,1.25\n0,001,3\n4,002,0.5\n"
+
+
+@pytest.mark.parametrize("value", ["a,b", 'say "hi"', "two\nlines", "cr\r"])
+def test_values_needing_quotes_are_rejected(tmp_path: Path, value: str) -> None:
+    path = tmp_path / "bad.csv"
+    with pytest.raises(ValueError, match="comma, quote or newline"):
+        write_csv_columns(path, {"crop": ["001", value]})
+    schema = pa.schema([("crop", pa.string())])
+    with pytest.raises(ValueError, match="comma, quote or newline"):
+        with csv_column_writer(path, schema) as writer:
+            writer.write_batch(pa.record_batch({"crop": [value]}, schema=schema))
+    assert not path.exists()
+
+
+def test_header_names_needing_quotes_are_rejected(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="column name"):
+        write_csv_columns(tmp_path / "bad.csv", {"a,b": [1]})
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mupattern_py.apps.kill.core import _clean_df, _find_violations, _load_csv, clean_predictions
+
+
+def _reference_clean(df: pd.DataFrame) -> tuple[list[tuple[int, str, bool]], list[tuple[int, str]]]:
+    """The original row loop: once a crop goes false, every later frame is forced false."""
+    rows, corrected = [], []
+    for crop_id, group in df.groupby("crop"):
+        seen_false = False
+        for _, row in group.sort_values("t").iterrows():
+            if not row["label"]:
+                seen_false = True
+                rows.append((row["t"], crop_id, False))
+            elif seen_false:
+                corrected.append((row["t"], crop_id))
+                rows.append((row["t"], crop_id, False))
+            else:
+                rows.append((row["t"], crop_id, True))
+    return rows, corrected
+
+
+def _frame(seed: int, missing: object) -> pd.DataFrame:
+    """Shuffled predictions for several crops with gaps in t and some missing labels."""
+    rng = np.random.default_rng(seed)
+    parts = []
+    for crop in ("000", "001", "007", "010"):
+        ts = np.sort(rng.choice(40, size=int(rng.integers(1, 20)), replace=False))
+        labels = pd.Series(rng.random(len(ts)) < 0.6, dtype=object)
+        labels[rng.random(len(ts)) < 0.15] = missing
+        parts.append(pd.DataFrame({"t": ts, "crop": crop, "label": labels}))
+    return pd.concat(parts).sample(frac=1, random_state=seed).reset_index(drop=True)
+
+
+@pytest.mark.parametrize("missing", [np.nan, None])
+@pytest.mark.parametrize("seed", range(6))
+def test_clean_matches_row_loop(seed: int, missing: object) -> None:
+    df = _frame(seed, missing)
+    # The original loop saw NaN for a missing label (read_csv), which is truthy
+    expected_rows, expected_corrected = _reference_clean(df.assign(label=df["label"].fillna(np.nan)))
+
+    cleaned, report = _clean_df(df)
+    rows = [
+        (t, c, bool(label) if pd.notna(label) else True)
+        for t, c, label in cleaned[["t", "crop", "label"]].itertuples(index=False)
+    ]
+    assert rows == expected_rows
+    assert list(zip(report["t"], report["crop"])) == expected_corrected
+    assert list(zip(_find_violations(df)["t"], _find_violations(df)["crop"])) == expected_corrected
+
+
+def test_clean_edge_cases() -> None:
+    empty = pd.DataFrame({"t": pd.Series(dtype=int), "crop": pd.Series(dtype=str), "label": pd.Series(dtype=bool)})
+    cleaned, report = _clean_df(empty)
+    assert cleaned.empty and report.empty
+
+    df = pd.DataFrame({"t": [5, 0, 9, 2], "crop": ["001"] * 4, "label": [True, True, True, False]})
+    cleaned, report = _clean_df(df)
+    assert cleaned["t"].tolist() == [0, 2, 5, 9]
+    assert cleaned["label"].tolist() == [True, False, False, False]
+    assert report["t"].tolist() == [5, 9]
+
+
+def test_clean_predictions_round_trip(tmp_path: Path) -> None:
+    source = tmp_path / "pred.csv"
+    source.write_text("t,crop,label\n0,001,true\n1,001,false\n2,001,true\n0,002,\n1,002,false\n")
+    output = tmp_path / "clean.csv"
+    report = clean_predictions(_load_csv(source), output)
+    assert output.read_text() == "t,crop,label\n0,001,true\n1,001,false\n2,001,false\n0,002,true\n1,002,false\n"
+    assert list(zip(report["t"], report["crop"])) == [(2, "001")]
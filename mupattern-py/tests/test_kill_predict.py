@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+torch = pytest.importorskip("torch")
+pytest.importorskip("pyarrow")
+zarr = pytest.importorskip("zarr")
+
+from mupattern_py.apps.kill import core  # noqa: E402
+
+TARGET_SIZE = (8, 8)
+MEAN = torch.tensor([0.485, 0.456, 0.406]).view(1, 3, 1, 1)
+STD = torch.tensor([0.229, 0.224, 0.225]).view(1, 3, 1, 1)
+
+
+class _MeanModel(torch.nn.Module):
+    """Per-row classifier: label is whether a frame's mean pixel value is above zero."""
+
+    def forward(self, pixel_values):
+        mean = pixel_values.mean((1, 2, 3))
+        return torch.stack([torch.zeros_like(mean), mean], dim=1)
+
+
+class _Collect:
+    """Collects written batches, copying them since slot buffers are reused."""
+
+    def __init__(self) -> None:
+        self.rows = []
+
+    def write_batch(self, batch) -> None:
+        cols = batch.to_pydict()
+        self.rows.extend(zip(cols["t"], cols["crop"], cols["label"]))
+
+
+@pytest.fixture
+def crops_zarr(tmp_path: Path) -> Path:
+    """Five crops with 5 timepoints each; crop 002 has a different frame size."""
+    path = tmp_path / "crops.zarr"
+    grp = zarr.open_group(str(path), mode="w", zarr_format=3).require_group("pos/000/crop")
+    rng = np.random.default_rng(0)
+    for i in range(5):
+        h, w = (7, 4) if i == 2 else (6, 5)
+        arr = grp.create_array(f"{i:03d}", shape=(5, 1, 1, h, w), chunks=(1, 1, 1, h, w), dtype=np.uint16)
+        arr[:] = rng.integers(0, 5000, (5, 1, 1, h, w))
+    return path
+
+
+def _naive_labels(path: Path) -> list[tuple[int, str, bool]]:
+    grp = zarr.open_group(str(path), mode="r")["pos/000/crop"]
+    model = _MeanModel()
+    rows = []
+    for crop_id in sorted(grp.keys()):
+        frames = core._normalize_frames(np.asarray(grp[crop_id][:, 0, 0]))
+        for t in range(len(frames)):
+            x = core._preprocess(frames[t : t + 1], torch.device("cpu"), TARGET_SIZE, MEAN, STD)
+            rows.append((t, crop_id, bool(torch.argmax(model(x), dim=-1)[0])))
+    return rows
+
+
+@pytest.mark.parametrize("batch_size", [1, 2, 3, 5, 7, 25, 64])
+def test_predict_position_matches_naive_loop(crops_zarr: Path, batch_size: int) -> None:
+    writer = _Collect()
+    written = core._predict_position(
+        crops_zarr,
+        0,
+        _MeanModel(),
+        torch.device("cpu"),
+        TARGET_SIZE,
+        MEAN,
+        STD,
+        batch_size,
+        None,
+        None,
+        writer,
+        None,
+    )
+    expected = _naive_labels(crops_zarr)
+    assert written == len(expected)
+    assert writer.rows == expected
+    assert {label for _t, _crop, label in expected} == {True, False}
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from mupattern_py.common.parallel import prefetch_iter, prefetch_map, resolve_jobs
+
+
+def _jittered_square(x: int) -> int:
+    time.sleep((x % 3) * 0.002)
+    return x * x
+
+
+def test_resolve_jobs() -> None:
+    assert resolve_jobs(3) == 3
+    assert resolve_jobs(0) == resolve_jobs(None) >= 1
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_prefetch_map_keeps_order(max_workers: int) -> None:
+    assert list(prefetch_map(_jittered_square, range(50), max_workers=max_workers)) == [x * x for x in range(50)]
+
+
+def test_prefetch_map_on_given_executor() -> None:
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        results = list(prefetch_map(_jittered_square, range(20), max_workers=3, executor=pool))
+    assert results == [x * x for x in range(20)]
+
+
+def test_prefetch_map_bounds_work_in_flight() -> None:
+    started = []
+
+    def fn(x: int) -> int:
+        started.append(x)
+        return x
+
+    it = prefetch_map(fn, range(100), max_workers=2, depth=4)
+    assert next(it) == 0
+    time.sleep(0.05)
+    assert len(started) <= 5
+
+
+def test_prefetch_map_propagates_exceptions_in_order() -> None:
+    def fn(x: int) -> int:
+        if x == 5:
+            raise RuntimeError("boom")
+        return x
+
+    results = []
+    with pytest.raises(RuntimeError, match="boom"):
+        for value in prefetch_map(fn, range(10), max_workers=4):
+            results.append(value)
+    assert results == [0, 1, 2, 3, 4]
+
+
+def test_prefetch_map_early_exit_stops_submitting() -> None:
+    started = []
+
+    def fn(x: int) -> int:
+        started.append(x)
+        return x
+
+    it = prefetch_map(fn, range(1000), max_workers=2, depth=4)
+    assert [next(it) for _ in range(3)] == [0, 1, 2]
+    it.close()
+    assert len(started) <= 3 + 4
+
+
+def test_prefetch_iter_keeps_order() -> None:
+    assert list(prefetch_iter(iter(range(100)), depth=3)) == list(range(100))
+
+
+def test_prefetch_iter_propagates_producer_exceptions() -> None:
+    def produce():
+        yield 1
+        yield 2
+        raise ValueError("bad item")
+
+    results = []
+    with pytest.raises(ValueError, match="bad item"):
+        for value in prefetch_iter(produce()):
+            results.append(value)
+    assert results == [1, 2]
+
+
+def test_prefetch_iter_early_exit_stops_producer() -> None:
+    produced = []
+    threads_before = threading.active_count()
+
+    def produce():
+        for i in range(10_000):
+            produced.append(i)
+            yield i
+
+    it = prefetch_iter(produce(), depth=2)
+    assert next(it) == 0
+    it.close()
+    n = len(produced)
+    time.sleep(0.05)
+    assert len(produced) == n <= 4
+    assert threading.active_count() == threads_before
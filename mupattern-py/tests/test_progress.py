@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from mupattern_py.common.progress import make_throttled_progress
+
+
+def test_throttled_progress_keeps_first_and_final_ticks() -> None:
+    seen = []
+    throttled = make_throttled_progress(lambda p, m: seen.append((p, m)), min_interval=3600)
+    for i in range(1, 101):
+        throttled(i / 100, f"step {i}")
+    throttled(1.0, "done")
+    assert seen == [(0.01, "step 1"), (1.0, "step 100"), (1.0, "done")]
+
+
+def test_throttled_progress_passes_spaced_ticks() -> None:
+    seen = []
+    throttled = make_throttled_progress(lambda p, m: seen.append(p), min_interval=0)
+    for i in range(5):
+        throttled(i / 4, "")
+    assert seen == [0.0, 0.25, 0.5, 0.75, 1.0]
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import pytest
+
+from mupattern_py.common.slices import _NUMPY_MIN_INDICES, SliceSpec, parse_slice_string, resolve_slice
+
+
+def _reference(s: str, length: int) -> list[int]:
+    """The original set-based parser, for comparison on valid input."""
+    if s.strip().lower() == "all":
+        return list(range(length))
+    indices: set[int] = set()
+    for segment in s.split(","):
+        segment = segment.strip()
+        if not segment:
+            continue
+        if ":" in segment:
+            parts = [(int(p) if p else None) for p in segment.split(":")]
+            indices.update(range(*slice(*parts).indices(length)))
+        else:
+            indices.add(int(segment) % length)
+    return sorted(indices)
+
+
+@pytest.mark.parametrize(
+    ("s", "expected"),
+    [
+        ("all", list(range(10))),
+        (" ALL ", list(range(10))),
+        ("1,3", [1, 3]),
+        ("3,1,3,1", [1, 3]),
+        ("-1", [9]),
+        ("-10,0,9", [0, 9]),
+        (" 2 , 4:6 ", [2, 4, 5]),
+        ("1,,2,", [1, 2]),
+        ("0:10:2", [0, 2, 4, 6, 8]),
+        ("::-3", [0, 3, 6, 9]),
+        ("-3:", [7, 8, 9]),
+        ("5:100", [5, 6, 7, 8, 9]),
+        ("0:4,2:6,5", [0, 1, 2, 3, 4, 5]),
+        ("+1,1_0:", [1]),
+    ],
+)
+def test_parse_slice_string(s: str, expected: list[int]) -> None:
+    assert parse_slice_string(s, 10) == expected
+
+
+@pytest.mark.parametrize(
+    ("s", "message"),
+    [
+        ("10", "out of range"),
+        ("-11", "out of range"),
+        ("0:5:0", "cannot be zero"),
+        ("a", "Invalid slice segment"),
+        ("1:x", "Invalid slice segment"),
+        ("1:2:3:4", "Invalid slice segment"),
+        ("", "produced no indices"),
+        ("5:2", "produced no indices"),
+        ("3,10", "out of range"),
+    ],
+)
+def test_parse_slice_string_errors(s: str, message: str) -> None:
+    with pytest.raises(ValueError, match=message):
+        parse_slice_string(s, 10)
+
+
+@pytest.mark.parametrize(
+    "n", [_NUMPY_MIN_INDICES - 1, _NUMPY_MIN_INDICES, _NUMPY_MIN_INDICES + 1, 5 * _NUMPY_MIN_INDICES]
+)
+def test_wide_selections_match_reference(n: int) -> None:
+    length = 10 * _NUMPY_MIN_INDICES
+    scalars = ",".join(str(i if i % 3 else -i - 1) for i in range(n)) + ",0,0"
+    ranges = f"0:{n},{n // 2}:{n + 7}:3,-{n}::2"
+    for s in (scalars, ranges, f"0:{n}"):
+        assert parse_slice_string(s, length) == _reference(s, length)
+
+
+def test_results_are_independent_copies() -> None:
+    first = parse_slice_string("0:5", 10)
+    first.append(99)
+    assert parse_slice_string("0:5", 10) == [0, 1, 2, 3, 4]
+
+
+def test_slice_spec_resolves_once() -> None:
+    spec = SliceSpec.parse("8,-1,0:3", 10)
+    assert spec.indices == (0, 1, 2, 8, 9)
+    assert resolve_slice(spec, 3) == [0, 1, 2, 8, 9]
+    assert resolve_slice("8,-1,0:3", 10) == [0, 1, 2, 8, 9]